@@ -1,11 +1,41 @@
 import os
-from typing import List
-from pydantic import BaseSettings
+from typing import List, Optional
+from dotenv import load_dotenv
+from pydantic import BaseModel
 
+# Load .env into the environment before the defaults below are evaluated.
+# Variables already set in the real environment take precedence.
+load_dotenv(".env")
 
-class Settings(BaseSettings):
+
+class Settings(BaseModel):
     # Database Configuration
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./dsrfa.db")
+    # Optional read replica for GET handlers. A client's reads stay on the
+    # primary for READ_YOUR_WRITES_SECONDS after each write it commits.
+    DATABASE_READ_URL: Optional[str] = os.getenv("DATABASE_READ_URL") or None
+    READ_YOUR_WRITES_SECONDS: int = int(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+    # Log a warning at startup when the database lags the latest migration
+    SCHEMA_CHECK_ON_STARTUP: bool = (
+        os.getenv("SCHEMA_CHECK_ON_STARTUP", "True").lower() == "true"
+    )
+    # Connection pool (PostgreSQL and file-backed SQLite)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "True").lower() == "true"
+    # SQLite pragmas applied to every new connection. WAL lets readers run
+    # while a writer commits and busy_timeout makes writers wait for the lock
+    # instead of failing with "database is locked".
+    SQLITE_JOURNAL_MODE: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", "268435456"))  # 256MB
+    SQLITE_CACHE_SIZE_KB: int = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+    SQLITE_FOREIGN_KEYS: bool = (
+        os.getenv("SQLITE_FOREIGN_KEYS", "True").lower() == "true"
+    )
 
     # Security
     SECRET_KEY: str = os.getenv(
@@ -13,8 +43,8 @@ class Settings(BaseSettings):
     )
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(
-        os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "43200")
-    )  # 30 days
+        os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "10080")
+    )  # 7 days
 
     # API Configuration
     API_HOST: str = os.getenv("API_HOST", "0.0.0.0")
@@ -31,8 +61,35 @@ class Settings(BaseSettings):
     # File Upload Configuration
     UPLOAD_DIRECTORY: str = os.getenv("UPLOAD_DIRECTORY", "./uploads")
     MAX_FILE_SIZE: int = int(os.getenv("MAX_FILE_SIZE", "10485760"))  # 10MB
+    MAX_VIDEO_FILE_SIZE: int = int(
+        os.getenv("MAX_VIDEO_FILE_SIZE", "524288000")
+    )  # 500MB
+    # Uploads are copied to disk this many bytes at a time
+    UPLOAD_CHUNK_SIZE: int = int(os.getenv("UPLOAD_CHUNK_SIZE", "1048576"))  # 1MB
+    # Chunk size suggested to resumable upload clients, and how long an
+    # unfinished resumable upload is kept
+    RESUMABLE_CHUNK_SIZE: int = int(os.getenv("RESUMABLE_CHUNK_SIZE", "8388608"))  # 8MB
+    UPLOAD_SESSION_TTL_HOURS: int = int(os.getenv("UPLOAD_SESSION_TTL_HOURS", "24"))
     ALLOWED_IMAGE_EXTENSIONS: List[str] = [".jpg", ".jpeg", ".png", ".gif", ".webp"]
     ALLOWED_VIDEO_EXTENSIONS: List[str] = [".mp4", ".avi", ".mov", ".wmv"]
+    # Public URL prefix under which UPLOAD_DIRECTORY is served
+    MEDIA_URL: str = os.getenv("MEDIA_URL", "/media")
+    # Stored media names are content-addressed, so they can be cached forever
+    MEDIA_CACHE_CONTROL: str = os.getenv(
+        "MEDIA_CACHE_CONTROL", "public, max-age=31536000, immutable"
+    )
+    MEDIA_CHUNK_SIZE: int = int(os.getenv("MEDIA_CHUNK_SIZE", "262144"))  # 256KB
+    # nginx internal location mapped to UPLOAD_DIRECTORY; when set, /media
+    # responses hand the file to nginx with X-Accel-Redirect
+    MEDIA_ACCEL_REDIRECT_PREFIX: Optional[str] = (
+        os.getenv("MEDIA_ACCEL_REDIRECT_PREFIX") or None
+    )
+    # Uploaded photos get WebP renditions bounded by these edges (pixels)
+    THUMBNAIL_MAX_EDGE: int = int(os.getenv("THUMBNAIL_MAX_EDGE", "320"))
+    MEDIUM_MAX_EDGE: int = int(os.getenv("MEDIUM_MAX_EDGE", "1280"))
+    WEBP_QUALITY: int = int(os.getenv("WEBP_QUALITY", "80"))
+    # Processes rendering them, started on the first upload
+    DERIVATIVE_WORKERS: int = int(os.getenv("DERIVATIVE_WORKERS", "2"))
 
     # Email Configuration
     EMAIL_HOST: str = os.getenv("EMAIL_HOST", "smtp.gmail.com")
@@ -60,13 +117,45 @@ class Settings(BaseSettings):
     # Pagination
     DEFAULT_PAGE_SIZE: int = 20
     MAX_PAGE_SIZE: int = 100
+    # Rows fetched per round trip by the streaming CSV/NDJSON exports
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+    # Largest id list accepted by the bulk member endpoints
+    BULK_MAX_IDS: int = int(os.getenv("BULK_MAX_IDS", "1000"))
+    # Rows validated, hashed and inserted together by the CSV imports
+    IMPORT_BATCH_SIZE: int = int(os.getenv("IMPORT_BATCH_SIZE", "500"))
 
     # Cache Settings
     CACHE_TTL: int = int(os.getenv("CACHE_TTL", "300"))  # 5 minutes
+    AUTH_CACHE_TTL: int = int(os.getenv("AUTH_CACHE_TTL", "60"))
+    AUTH_CACHE_SIZE: int = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
+    # Cache-Control sent with the public catalog reads (events, clubs,
+    # sponsors, gallery). Clients and CDNs revalidate with ETags afterwards.
+    CATALOG_CACHE_CONTROL: str = os.getenv(
+        "CATALOG_CACHE_CONTROL", "public, max-age=60"
+    )
+
+    # Response Compression
+    # JSON and text bodies of at least COMPRESSION_MINIMUM_SIZE bytes are
+    # compressed with brotli when installed (the "compression" extra), else gzip.
+    COMPRESSION_MINIMUM_SIZE: int = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+    COMPRESSION_CACHE_SIZE: int = int(os.getenv("COMPRESSION_CACHE_SIZE", "256"))
+
+    # Concurrency
+    # Endpoints doing database work are sync and run in this worker thread
+    # pool, so a slow query only ties up one thread instead of the event loop.
+    DB_THREADPOOL_SIZE: int = int(os.getenv("DB_THREADPOOL_SIZE", "40"))
 
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    # Password Hashing
+    # bcrypt runs in its own executor ("thread" or "process"). At most
+    # WORKERS + QUEUE_SIZE hash requests are admitted at once; the rest get a
+    # 503 with Retry-After. Keep the total below DB_THREADPOOL_SIZE so a login
+    # storm cannot occupy every request thread.
+    PASSWORD_HASH_EXECUTOR: str = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+    PASSWORD_HASH_QUEUE_SIZE: int = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", "16"))
+    PASSWORD_HASH_RETRY_AFTER: int = int(os.getenv("PASSWORD_HASH_RETRY_AFTER", "2"))
 
 
 # Create settings instance
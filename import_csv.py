@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Bulk CSV import of members and clubs for DSRFA Backend API
+Validates rows in batches and reports row-level errors without stopping
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+
+from sqlalchemy.orm import sessionmaker
+
+from main import PasswordHasher, create_db_engine, import_clubs, import_members
+from config import settings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Import members or clubs from a CSV file with a header row."
+    )
+    parser.add_argument("kind", choices=["members", "clubs"])
+    parser.add_argument("path", help="CSV file to import")
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="validate and report without writing anything",
+    )
+    args = parser.parse_args()
+
+    engine = create_db_engine(settings.DATABASE_URL)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    # A one-off import can use every core for bcrypt
+    hasher = PasswordHasher(workers=os.cpu_count() or 1, queue_size=0)
+
+    try:
+        with open(args.path, newline="", encoding="utf-8-sig") as csv_file:
+            rows = csv.DictReader(csv_file)
+            if args.kind == "members":
+                report = import_members(db, rows, hasher, dry_run=args.dry_run)
+            else:
+                report = import_clubs(db, rows, dry_run=args.dry_run)
+    finally:
+        db.close()
+        hasher.shutdown()
+        engine.dispose()
+
+    print(json.dumps(report, indent=2))
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
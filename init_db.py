@@ -1,16 +1,18 @@
 #!/usr/bin/env python3
 """
 Database initialization script for DSRFA Backend API
-Creates tables and inserts sample data for development
+Applies schema migrations and inserts sample data for development
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import inspect
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime, timedelta
+from alembic import command
+from alembic.config import Config
 import bcrypt
+import os
 
 from main import (
-    Base,
     User,
     Club,
     Event,
@@ -20,6 +22,7 @@ from main import (
     MembershipStatus,
     EventStatus,
     EventCategory,
+    create_db_engine,
 )
 from config import settings
 
@@ -28,17 +31,31 @@ def hash_password(password: str) -> str:
     return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
 
 
+def run_migrations(engine):
+    """Upgrade the schema to the latest Alembic revision.
+
+    Databases created before migrations existed (via create_all) already
+    contain the initial schema, so they are stamped at 0001 first.
+    """
+    alembic_cfg = Config(
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini")
+    )
+    alembic_cfg.set_main_option(
+        "sqlalchemy.url", settings.DATABASE_URL.replace("%", "%%")
+    )
+
+    inspector = inspect(engine)
+    if inspector.has_table("users") and not inspector.has_table("alembic_version"):
+        command.stamp(alembic_cfg, "0001")
+    command.upgrade(alembic_cfg, "head")
+
+
 def init_database():
     # Create database engine
-    engine = create_engine(
-        settings.DATABASE_URL,
-        connect_args=(
-            {"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
-        ),
-    )
+    engine = create_db_engine(settings.DATABASE_URL)
 
-    # Create all tables
-    Base.metadata.create_all(bind=engine)
+    # Create or upgrade tables
+    run_migrations(engine)
 
     # Create session
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
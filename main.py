@@ -1,13 +1,44 @@
-from fastapi import FastAPI, HTTPException, Depends, status, UploadFile, File, Form
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    FastAPI,
+    HTTPException,
+    Depends,
+    status,
+    UploadFile,
+    File,
+    Form,
+    Query,
+    Request,
+    Response,
+)
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from pydantic import BaseModel, EmailStr
-from typing import Optional, List, Dict, Any
-from datetime import datetime, date, timedelta
+from pydantic import BaseModel, ConfigDict, EmailStr, ValidationError
+from contextlib import asynccontextmanager
+from typing import Optional, List, Dict, Any, Generic, Iterable, TypeVar, Union
+from datetime import datetime, date, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
 from enum import Enum
+from collections import OrderedDict
+from contextvars import ContextVar
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 import jwt
+import base64
 import bcrypt
+import csv
+import hashlib
+import io
+import json
+import logging
+import multiprocessing
+import orjson
+import re
+import threading
+import time
 import uuid
+import zlib
 from sqlalchemy import (
     create_engine,
     Column,
@@ -18,38 +49,125 @@ from sqlalchemy import (
     Float,
     Text,
     ForeignKey,
+    Index,
+    tuple_,
+    update,
+    insert,
+    case,
+    or_,
+    select,
+    func,
+    true,
+    delete,
+    inspect,
+    text,
+    bindparam,
 )
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.event import listen
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session, relationship
+from sqlalchemy.orm import (
+    sessionmaker,
+    Session,
+    relationship,
+    joinedload,
+    load_only,
+)
+import anyio
 import os
-
-# FastAPI app initialization
-app = FastAPI(
-    title="DSRFA Backend API",
-    description="Davao-South Regional Football Association - Backend API for member management, events, and community engagement",
-    version="1.2.5",
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # optional, installed with the "compression" extra
+    brotli = None
+
+from config import settings
+from media import (
+    StoredMedia,
+    create_part_file,
+    delete_media,
+    discard_file,
+    generate_derivatives,
+    hash_part_file,
+    locked_part_file,
+    media_response,
+    media_type_for,
+    media_url,
+    place_file,
+    remove_media,
+    save_upload,
+    session_part_name,
+    shutdown_derivatives,
+    size_limit_for,
+    write_chunk,
 )
 
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # In production, specify your frontend domain
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+logger = logging.getLogger(__name__)
+
+# Routes are collected here and mounted by create_app()
+router = APIRouter()
 
 # Security
 security = HTTPBearer()
-SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here")
-ALGORITHM = "HS256"
+SECRET_KEY = settings.SECRET_KEY
+ALGORITHM = settings.ALGORITHM
+
 
 # Database setup (SQLite for development)
-SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./dsrfa.db")
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def _configure_sqlite_connection(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}")
+        # A negative cache_size is a size in KiB rather than a page count
+        cursor.execute(f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}")
+        foreign_keys = "ON" if settings.SQLITE_FOREIGN_KEYS else "OFF"
+        cursor.execute(f"PRAGMA foreign_keys={foreign_keys}")
+    finally:
+        cursor.close()
+
+
+def create_db_engine(url: str):
+    """Create an engine tuned for the database behind ``url``.
+
+    SQLite connections get the pragmas from config.Settings as they are
+    opened; other databases get an explicitly sized, pre-pinged pool.
+    """
+    pool_options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+    database_url = make_url(url)
+    if database_url.get_backend_name() != "sqlite":
+        return create_engine(
+            url,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            **pool_options,
+        )
+
+    # In-memory databases live and die with their single connection
+    if database_url.database in (None, "", ":memory:"):
+        pool_options = {}
+    engine = create_engine(
+        url, connect_args={"check_same_thread": False}, **pool_options
+    )
+    listen(engine, "connect", _configure_sqlite_connection)
+    return engine
+
+
+# Both factories are bound to their engines by lifespan() at startup, so
+# importing this module never opens a connection. ReadSessionLocal uses the
+# optional read replica and falls back to the primary.
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False)
 Base = declarative_base()
 
 
@@ -92,6 +210,23 @@ class PaymentStatus(str, Enum):
     REFUNDED = "Refunded"
 
 
+class BulkUserAction(str, Enum):
+    APPROVE = "approve"
+    REJECT = "reject"
+    EXPIRE = "expire"
+    DEACTIVATE = "deactivate"
+
+
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class UploadTarget(str, Enum):
+    GALLERY = "gallery"
+    EVENT_MEDIA = "event_media"
+
+
 # Database Models
 class User(Base):
     __tablename__ = "users"
@@ -103,10 +238,10 @@ class User(Base):
     phone = Column(String)
     address = Column(String)
     role = Column(String, default=UserRole.PLAYER)
-    club_id = Column(String, ForeignKey("clubs.id"))
+    club_id = Column(String, ForeignKey("clubs.id"), index=True)
     position = Column(String)
     bio = Column(Text)
-    membership_status = Column(String, default=MembershipStatus.PENDING)
+    membership_status = Column(String, default=MembershipStatus.PENDING, index=True)
     membership_expiry = Column(DateTime)
     emergency_contact = Column(String)
     medical_info = Column(Text)
@@ -121,6 +256,11 @@ class User(Base):
     event_registrations = relationship("EventRegistration", back_populates="user")
     payments = relationship("Payment", back_populates="user")
 
+    __table_args__ = (
+        Index("ix_users_role_membership_status", "role", "membership_status"),
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
+
 
 class Club(Base):
     __tablename__ = "clubs"
@@ -147,6 +287,8 @@ class Club(Base):
     members = relationship("User", back_populates="club")
     events = relationship("Event", back_populates="organizing_club")
 
+    __table_args__ = (Index("ix_clubs_created_at_id", "created_at", "id"),)
+
 
 class Event(Base):
     __tablename__ = "events"
@@ -154,13 +296,15 @@ class Event(Base):
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     title = Column(String, nullable=False)
     description = Column(Text)
-    category = Column(String, nullable=False)
-    date = Column(DateTime, nullable=False)
+    category = Column(String, nullable=False, index=True)
+    date = Column(DateTime, nullable=False, index=True)
     time = Column(String)
     venue = Column(String)
     location = Column(String)
     age_group = Column(String)
     max_participants = Column(Integer)
+    # Maintained by register_for_event; avoids COUNT(*) capacity checks.
+    registered_count = Column(Integer, nullable=False, default=0, server_default="0")
     registration_fee = Column(Float, default=0.0)
     status = Column(String, default=EventStatus.OPEN)
     image = Column(String)
@@ -175,13 +319,18 @@ class Event(Base):
     registrations = relationship("EventRegistration", back_populates="event")
     media = relationship("EventMedia", back_populates="event")
 
+    __table_args__ = (
+        Index("ix_events_status_date", "status", "date"),
+        Index("ix_events_created_at_id", "created_at", "id"),
+    )
+
 
 class EventRegistration(Base):
     __tablename__ = "event_registrations"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     event_id = Column(String, ForeignKey("events.id"))
-    user_id = Column(String, ForeignKey("users.id"))
+    user_id = Column(String, ForeignKey("users.id"), index=True)
     player_name = Column(String)
     player_position = Column(String)
     team_name = Column(String)
@@ -196,6 +345,16 @@ class EventRegistration(Base):
     event = relationship("Event", back_populates="registrations")
     user = relationship("User", back_populates="event_registrations")
 
+    __table_args__ = (
+        # One registration per user per event; also serves capacity counts.
+        Index(
+            "ix_event_registrations_event_id_user_id",
+            "event_id",
+            "user_id",
+            unique=True,
+        ),
+    )
+
 
 class Payment(Base):
     __tablename__ = "payments"
@@ -204,7 +363,7 @@ class Payment(Base):
     user_id = Column(String, ForeignKey("users.id"))
     event_id = Column(String, ForeignKey("events.id"), nullable=True)
     amount = Column(Float, nullable=False)
-    payment_type = Column(String)  # membership, event, renewal
+    payment_type = Column(String, index=True)  # membership, event, renewal
     payment_method = Column(String)  # bank_transfer, gcash, credit_card
     status = Column(String, default=PaymentStatus.PENDING)
     transaction_id = Column(String)
@@ -214,6 +373,12 @@ class Payment(Base):
     # Relationships
     user = relationship("User", back_populates="payments")
 
+    __table_args__ = (
+        Index("ix_payments_user_id_payment_date", "user_id", "payment_date"),
+        Index("ix_payments_status_payment_type", "status", "payment_type"),
+        Index("ix_payments_payment_date_id", "payment_date", "id"),
+    )
+
 
 class Sponsor(Base):
     __tablename__ = "sponsors"
@@ -232,35 +397,144 @@ class Sponsor(Base):
     end_date = Column(DateTime)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (Index("ix_sponsors_created_at_id", "created_at", "id"),)
+
+
+class MediaBlob(Base):
+    """A stored file, shared by every gallery and event media row with the
+    same content."""
+
+    __tablename__ = "media_blobs"
+
+    content_hash = Column(String, primary_key=True)  # hex SHA-256
+    filename = Column(String, nullable=False)  # relative to UPLOAD_DIRECTORY
+    media_type = Column(String)
+    file_size = Column(Integer)
+    thumbnail_filename = Column(String)
+    medium_filename = Column(String)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class MediaFile:
+    """URLs of an uploaded file and its WebP renditions."""
+
+    # Response fields computed from columns, for load_fields
+    derived_columns = {
+        "url": ["filename"],
+        "thumbnail_url": ["thumbnail_filename"],
+        "medium_url": ["medium_filename"],
+    }
+
+    @property
+    def url(self) -> Optional[str]:
+        return media_url(self.filename)
+
+    @property
+    def thumbnail_url(self) -> Optional[str]:
+        return media_url(self.thumbnail_filename)
+
+    @property
+    def medium_url(self) -> Optional[str]:
+        return media_url(self.medium_filename)
 
 
-class EventMedia(Base):
+class EventMedia(MediaFile, Base):
     __tablename__ = "event_media"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    event_id = Column(String, ForeignKey("events.id"))
-    filename = Column(String, nullable=False)
+    event_id = Column(String, ForeignKey("events.id"), index=True)
+    filename = Column(String, nullable=False)  # relative to UPLOAD_DIRECTORY
     media_type = Column(String)  # photo, video
     caption = Column(String)
     uploaded_by = Column(String, ForeignKey("users.id"))
     uploaded_at = Column(DateTime, default=datetime.utcnow)
+    content_hash = Column(String, index=True)  # hex SHA-256, see MediaBlob
+    file_size = Column(Integer)
+    # WebP renditions, filled in in the background after upload
+    thumbnail_filename = Column(String)
+    medium_filename = Column(String)
 
     # Relationships
     event = relationship("Event", back_populates="media")
 
 
-class Gallery(Base):
+class Gallery(MediaFile, Base):
     __tablename__ = "gallery"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     title = Column(String)
-    filename = Column(String, nullable=False)
-    media_type = Column(String)  # photo, video
+    filename = Column(String, nullable=False)  # relative to UPLOAD_DIRECTORY
+    media_type = Column(String, index=True)  # photo, video
     caption = Column(String)
-    event_id = Column(String, ForeignKey("events.id"), nullable=True)
+    event_id = Column(String, ForeignKey("events.id"), nullable=True, index=True)
     uploaded_by = Column(String, ForeignKey("users.id"))
     uploaded_at = Column(DateTime, default=datetime.utcnow)
     is_featured = Column(Boolean, default=False)
+    content_hash = Column(String, index=True)  # hex SHA-256, see MediaBlob
+    file_size = Column(Integer)
+    # WebP renditions, filled in in the background after upload
+    thumbnail_filename = Column(String)
+    medium_filename = Column(String)
+
+    __table_args__ = (Index("ix_gallery_uploaded_at_id", "uploaded_at", "id"),)
+
+
+class UploadSession(Base):
+    """A resumable upload in progress; its bytes are in session_part_name(id)."""
+
+    __tablename__ = "upload_sessions"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    target = Column(String, nullable=False)  # UploadTarget
+    filename = Column(String, nullable=False)  # client's name, for the extension
+    media_type = Column(String)  # photo, video
+    total_size = Column(Integer, nullable=False)
+    received = Column(Integer, nullable=False, default=0)
+    checksum = Column(String)  # expected hex SHA-256
+    title = Column(String)
+    caption = Column(String)
+    event_id = Column(String, ForeignKey("events.id"), nullable=True)
+    created_by = Column(String, ForeignKey("users.id"))
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    expires_at = Column(DateTime, index=True)
+
+
+class PaymentMonthlyRollup(Base):
+    """Per-month, per-payment-type totals kept in step with payment statuses."""
+
+    __tablename__ = "payment_monthly_rollups"
+
+    month = Column(String, primary_key=True)  # YYYY-MM of payment_date
+    payment_type = Column(String, primary_key=True)
+    completed_amount = Column(Float, nullable=False, default=0.0, server_default="0")
+    completed_count = Column(Integer, nullable=False, default=0, server_default="0")
+    refunded_amount = Column(Float, nullable=False, default=0.0, server_default="0")
+    refunded_count = Column(Integer, nullable=False, default=0, server_default="0")
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class SearchDocument(Base):
+    """Searchable text of one user, club or event, kept in sync on flush.
+
+    The full-text index over ``title`` and ``body`` is not part of this
+    metadata: it is an FTS5 table on SQLite and a generated tsvector column on
+    PostgreSQL, both created by migration 0007.
+    """
+
+    __tablename__ = "search_documents"
+    __table_args__ = (
+        Index("ix_search_documents_entity", "entity_type", "entity_id", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True)
+    entity_type = Column(String, nullable=False)
+    entity_id = Column(String, nullable=False)
+    title = Column(String, nullable=False)
+    body = Column(Text, nullable=False)
 
 
 class SystemSettings(Base):
@@ -278,10 +552,6 @@ class SystemSettings(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
-# Create tables
-Base.metadata.create_all(bind=engine)
-
-
 # Pydantic Models
 class UserCreate(BaseModel):
     name: str
@@ -321,6 +591,30 @@ class UserResponse(BaseModel):
     last_login: Optional[datetime]
 
 
+class UserFilter(BaseModel):
+    role: Optional[str] = None
+    status: Optional[str] = None
+    club_id: Optional[str] = None
+    expires_before: Optional[datetime] = None
+
+
+class BulkUserUpdate(BaseModel):
+    action: BulkUserAction
+    ids: Optional[List[str]] = None
+    filter: Optional[UserFilter] = None
+
+
+class BulkUserOutcome(BaseModel):
+    id: str
+    outcome: str  # updated, unchanged, skipped or not_found
+
+
+class BulkUserResult(BaseModel):
+    action: BulkUserAction
+    updated: int
+    results: List[BulkUserOutcome]
+
+
 class ClubCreate(BaseModel):
     name: str
     description: Optional[str] = None
@@ -380,6 +674,506 @@ class SponsorCreate(BaseModel):
     end_date: Optional[datetime] = None
 
 
+class UploadSessionCreate(BaseModel):
+    target: UploadTarget
+    filename: str
+    size: int
+    checksum: Optional[str] = None  # hex SHA-256, or given on completion
+    title: Optional[str] = None
+    caption: Optional[str] = None
+    event_id: Optional[str] = None
+
+
+class UploadSessionComplete(BaseModel):
+    checksum: Optional[str] = None
+
+
+class ORMResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ClubResponse(ORMResponse):
+    id: str
+    name: str
+    description: Optional[str] = None
+    location: Optional[str] = None
+    contact_email: Optional[str] = None
+    contact_phone: Optional[str] = None
+    website: Optional[str] = None
+    logo: Optional[str] = None
+    founded_date: Optional[datetime] = None
+    coach_name: Optional[str] = None
+    coach_contact: Optional[str] = None
+    home_venue: Optional[str] = None
+    jersey_colors: Optional[str] = None
+    achievements: Optional[str] = None
+    is_active: Optional[bool] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class EventResponse(ORMResponse):
+    id: str
+    title: str
+    description: Optional[str] = None
+    category: str
+    date: datetime
+    time: Optional[str] = None
+    venue: Optional[str] = None
+    location: Optional[str] = None
+    age_group: Optional[str] = None
+    max_participants: Optional[int] = None
+    registered_count: int = 0
+    registration_fee: Optional[float] = None
+    status: Optional[str] = None
+    image: Optional[str] = None
+    organizer: Optional[str] = None
+    organizing_club_id: Optional[str] = None
+    created_by: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class EventRegistrationResponse(ORMResponse):
+    id: str
+    event_id: Optional[str] = None
+    user_id: Optional[str] = None
+    player_name: Optional[str] = None
+    player_position: Optional[str] = None
+    team_name: Optional[str] = None
+    emergency_contact: Optional[str] = None
+    medical_conditions: Optional[str] = None
+    registration_date: Optional[datetime] = None
+    payment_status: Optional[str] = None
+    payment_proof: Optional[str] = None
+    status: Optional[str] = None
+
+
+class PaymentResponse(ORMResponse):
+    id: str
+    user_id: Optional[str] = None
+    event_id: Optional[str] = None
+    amount: float
+    payment_type: Optional[str] = None
+    payment_method: Optional[str] = None
+    status: Optional[str] = None
+    transaction_id: Optional[str] = None
+    description: Optional[str] = None
+    payment_date: Optional[datetime] = None
+
+
+class SponsorResponse(ORMResponse):
+    id: str
+    name: str
+    description: Optional[str] = None
+    logo: Optional[str] = None
+    website: Optional[str] = None
+    contact_person: Optional[str] = None
+    contact_email: Optional[str] = None
+    contact_phone: Optional[str] = None
+    sponsorship_type: Optional[str] = None
+    sponsorship_amount: Optional[float] = None
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    is_active: Optional[bool] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class GalleryResponse(ORMResponse):
+    id: str
+    title: Optional[str] = None
+    filename: str
+    media_type: Optional[str] = None
+    caption: Optional[str] = None
+    event_id: Optional[str] = None
+    uploaded_by: Optional[str] = None
+    uploaded_at: Optional[datetime] = None
+    is_featured: Optional[bool] = None
+    content_hash: Optional[str] = None
+    file_size: Optional[int] = None
+    url: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+    medium_url: Optional[str] = None
+
+
+class EventMediaResponse(ORMResponse):
+    id: str
+    event_id: str
+    filename: str
+    media_type: Optional[str] = None
+    caption: Optional[str] = None
+    uploaded_by: Optional[str] = None
+    uploaded_at: Optional[datetime] = None
+    content_hash: Optional[str] = None
+    file_size: Optional[int] = None
+    url: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+    medium_url: Optional[str] = None
+
+
+class UploadSessionResponse(ORMResponse):
+    id: str
+    target: UploadTarget
+    filename: str
+    media_type: Optional[str] = None
+    total_size: int
+    received: int
+    expires_at: Optional[datetime] = None
+    chunk_size: int = settings.RESUMABLE_CHUNK_SIZE
+
+
+class SystemSettingsResponse(ORMResponse):
+    id: str
+    site_name: Optional[str] = None
+    maintenance_mode: Optional[bool] = None
+    registration_enabled: Optional[bool] = None
+    email_notifications: Optional[bool] = None
+    sms_notifications: Optional[bool] = None
+    auto_approval: Optional[bool] = None
+    membership_fee: Optional[float] = None
+    session_timeout: Optional[int] = None
+    updated_at: Optional[datetime] = None
+
+
+ItemT = TypeVar("ItemT")
+
+
+class CursorPage(BaseModel, Generic[ItemT]):
+    items: List[ItemT]
+    next_cursor: Optional[str]
+
+
+# List endpoints return a bare list in offset mode and a CursorPage otherwise
+UserListResponse = Union[List[UserResponse], CursorPage[UserResponse]]
+ClubListResponse = Union[List[ClubResponse], CursorPage[ClubResponse]]
+EventListResponse = Union[List[EventResponse], CursorPage[EventResponse]]
+PaymentListResponse = Union[List[PaymentResponse], CursorPage[PaymentResponse]]
+SponsorListResponse = Union[List[SponsorResponse], CursorPage[SponsorResponse]]
+GalleryListResponse = Union[List[GalleryResponse], CursorPage[GalleryResponse]]
+
+
+class MemberImportRow(UserCreate):
+    # Club name or id; resolved to club_id during the import
+    club: Optional[str] = None
+    membership_status: MembershipStatus = MembershipStatus.PENDING
+
+
+class ImportRowError(BaseModel):
+    line: int
+    error: str
+
+
+class ImportReport(BaseModel):
+    kind: str
+    total: int
+    created: int
+    dry_run: bool
+    errors: List[ImportRowError]
+
+
+class SearchResult(BaseModel):
+    type: str
+    id: str
+    title: str
+    score: float
+
+
+class AuthenticatedUser(BaseModel):
+    """The slice of a user row that authorization checks need."""
+
+    id: str
+    role: str
+    is_active: bool
+    club: Optional[str]
+
+
+# In-process caches
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire ``ttl`` seconds after set."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Any, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self._misses += 1
+                return default
+            self._data.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+
+# Authenticated principals keyed by token subject (user id). Entries are
+# dropped whenever the user's role, status or club changes.
+principal_cache = TTLCache(
+    maxsize=settings.AUTH_CACHE_SIZE, ttl=settings.AUTH_CACHE_TTL
+)
+
+# Admin dashboard rollup. Cleared by any write to users, clubs, events or
+# payments; CACHE_TTL bounds staleness for writes made by other workers.
+dashboard_cache = TTLCache(maxsize=1, ttl=settings.CACHE_TTL)
+
+# Commit times of the current request's primary sessions, collected for
+# WriteMarkerMiddleware. The list is shared with the threads that run sync
+# handlers, which get a copy of the request's context.
+request_commits: ContextVar[Optional[List[float]]] = ContextVar(
+    "request_commits", default=None
+)
+
+
+# Response compression
+COMPRESSIBLE_CONTENT_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+# Compressed bodies of cacheable responses keyed by (ETag, encoding), so a hot
+# catalog page is compressed once rather than on every request.
+compression_cache = TTLCache(
+    maxsize=settings.COMPRESSION_CACHE_SIZE, ttl=settings.CACHE_TTL
+)
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    accepted: Dict[str, float] = {}
+    for item in header.split(","):
+        token, _, params = item.partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[token] = quality
+    return accepted
+
+
+class CompressionMiddleware:
+    """Compress JSON and text responses with brotli (when installed) or gzip.
+
+    Complete bodies smaller than ``minimum_size`` are sent as-is. Bodies of
+    responses with an ETag and a public Cache-Control are served from
+    ``compression_cache``; streamed bodies are compressed chunk by chunk.
+    """
+
+    def __init__(
+        self, app, minimum_size: int, gzip_level: int, brotli_quality: int
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = self.choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    @staticmethod
+    def choose_encoding(accept_encoding: str) -> Optional[str]:
+        accepted = parse_accept_encoding(accept_encoding)
+        wildcard = accepted.get("*", 0.0)
+        candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+        best, best_quality = None, 0.0
+        for candidate in candidates:
+            quality = accepted.get(candidate, wildcard)
+            if quality > best_quality:
+                best, best_quality = candidate, quality
+        return best
+
+    def compressor(self, encoding: str):
+        if encoding == "br":
+            return brotli.Compressor(quality=self.brotli_quality)
+        # wbits=31 writes a gzip container rather than a raw zlib stream
+        return zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        compressor = self.compressor(encoding)
+        return compressor.compress(body) + compressor.flush()
+
+    async def compress_body(
+        self, body: bytes, encoding: str, headers: MutableHeaders
+    ) -> bytes:
+        etag = headers.get("etag")
+        cache_control = headers.get("cache-control", "")
+        cacheable = etag is not None and "public" in cache_control
+        if cacheable:
+            cached = compression_cache.get((etag, encoding))
+            if cached is not None:
+                return cached
+        # Large pages take milliseconds to compress; keep that off the loop
+        compressed = await anyio.to_thread.run_sync(self.compress, body, encoding)
+        if cacheable:
+            compression_cache.set((etag, encoding), compressed)
+        return compressed
+
+
+class _CompressionResponder:
+    """Per-request ``send`` wrapper used by CompressionMiddleware."""
+
+    def __init__(
+        self, middleware: CompressionMiddleware, encoding: Optional[str], send
+    ) -> None:
+        self.middleware = middleware
+        self.encoding = encoding
+        self.downstream = send
+        self.start_message = None
+        self.stream = None
+
+    @staticmethod
+    def is_compressible(status_code: int, headers: MutableHeaders) -> bool:
+        if status_code < 200 or status_code >= 300 or status_code in (204, 206):
+            return False
+        if "content-encoding" in headers or "content-range" in headers:
+            return False
+        if "no-transform" in headers.get("cache-control", ""):
+            return False
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(COMPRESSIBLE_CONTENT_TYPES)
+
+    async def send(self, message) -> None:
+        if message["type"] == "http.response.start":
+            # Hold the headers until the first body chunk shows the size
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body":
+            await self.downstream(message)
+            return
+        if self.start_message is None:
+            await self.send_chunk(message)
+            return
+
+        start, self.start_message = self.start_message, None
+        headers = MutableHeaders(raw=start["headers"])
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self.is_compressible(start["status"], headers):
+            await self.downstream(start)
+            await self.downstream(message)
+            return
+        headers.add_vary_header("Accept-Encoding")
+        if self.encoding is None or (
+            not more_body and len(body) < self.middleware.minimum_size
+        ):
+            await self.downstream(start)
+            await self.downstream(message)
+            return
+
+        headers["Content-Encoding"] = self.encoding
+        if not more_body:
+            compressed = await self.middleware.compress_body(
+                body, self.encoding, headers
+            )
+            headers["Content-Length"] = str(len(compressed))
+            await self.downstream(start)
+            await self.downstream({"type": "http.response.body", "body": compressed})
+            return
+
+        del headers["Content-Length"]
+        self.stream = self.middleware.compressor(self.encoding)
+        await self.downstream(start)
+        await self.send_chunk(message)
+
+    async def send_chunk(self, message) -> None:
+        if self.stream is None:
+            await self.downstream(message)
+            return
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.encoding == "br":
+            chunk = self.stream.process(body)
+            chunk += self.stream.flush() if more_body else self.stream.finish()
+        else:
+            chunk = self.stream.compress(body)
+            chunk += self.stream.flush(
+                zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH
+            )
+        await self.downstream(
+            {"type": "http.response.body", "body": chunk, "more_body": more_body}
+        )
+
+
+# Read-your-writes
+WRITE_MARKER_COOKIE = "last_write"
+
+
+class WriteMarkerMiddleware:
+    """Set ``WRITE_MARKER_COOKIE`` to the commit time on responses to requests
+    that wrote to the primary.
+
+    The marker travels with the client, so its next reads go to the primary
+    whichever worker serves them (see ``read_session_factory``).
+    """
+
+    def __init__(self, app, max_age: int) -> None:
+        self.app = app
+        self.max_age = max_age
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        commits: List[float] = []
+        token = request_commits.set(commits)
+
+        async def send_with_marker(message) -> None:
+            if message["type"] == "http.response.start" and commits:
+                MutableHeaders(scope=message).append(
+                    "set-cookie",
+                    f"{WRITE_MARKER_COOKIE}={commits[-1]:.3f}; "
+                    f"Max-Age={self.max_age}; Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_marker)
+        finally:
+            request_commits.reset(token)
+
+
 # Dependency functions
 def get_db():
     db = SessionLocal()
@@ -389,26 +1183,198 @@ def get_db():
         db.close()
 
 
-def hash_password(password: str) -> str:
+def _record_commit(session):
+    commits = request_commits.get()
+    if commits is not None:
+        commits.append(time.time())
+
+
+if settings.DATABASE_READ_URL:
+    listen(SessionLocal, "after_commit", _record_commit)
+
+
+def read_session_factory(request: Request):
+    """Session factory for the reads of ``request``: the replica, unless the
+    client's write marker says it committed a write the replica may not have
+    caught up with yet."""
+    if not settings.DATABASE_READ_URL:
+        return SessionLocal
+    try:
+        written_at = float(request.cookies.get(WRITE_MARKER_COOKIE, ""))
+    except ValueError:
+        return ReadSessionLocal
+    if time.time() - written_at < settings.READ_YOUR_WRITES_SECONDS:
+        return SessionLocal
+    return ReadSessionLocal
+
+
+def get_read_db(request: Request):
+    """Session on the read replica, or on the primary for a client whose own
+    write may not have been replicated yet."""
+    db = read_session_factory(request)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _bcrypt_hash(password: str) -> str:
     return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
 
 
-def verify_password(password: str, hashed_password: str) -> bool:
+def _bcrypt_check(password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(password.encode("utf-8"), hashed_password.encode("utf-8"))
 
 
+class PasswordHasher:
+    """Runs bcrypt in a dedicated executor with bounded admission.
+
+    Up to ``workers`` hashes run concurrently and ``queue_size`` more may wait
+    for a worker. Anything beyond that is rejected immediately with a 503 so
+    that login storms cannot pin every request thread.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        queue_size: int,
+        executor: str = "thread",
+        retry_after: int = 2,
+    ):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.executor_type = executor
+        self.retry_after = retry_after
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.executor_type == "process":
+                    # spawn rather than fork: the pool starts on the first
+                    # login, when the event loop and worker threads are live.
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers, thread_name_prefix="bcrypt"
+                    )
+            return self._executor
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Server is busy, please try again shortly",
+                headers={"Retry-After": str(self.retry_after)},
+            )
+
+        started = time.perf_counter()
+        with self._lock:
+            self._in_flight += 1
+        try:
+            return self._get_executor().submit(fn, *args).result()
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._in_flight -= 1
+                self._completed += 1
+                self._total_latency += elapsed
+                self._max_latency = max(self._max_latency, elapsed)
+            self._slots.release()
+
+    def hash(self, password: str) -> str:
+        return self._run(_bcrypt_hash, password)
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        return self._run(_bcrypt_check, password, hashed_password)
+
+    def hash_many(self, passwords: List[str]) -> List[str]:
+        """Hash a batch of passwords in parallel for bulk imports.
+
+        Work is handed to the executor ``workers`` at a time, so interactive
+        logins queue behind at most one round of import hashes. Each chunk
+        counts towards ``stats()`` like that many concurrent ``hash`` calls.
+        """
+        executor = self._get_executor()
+        hashes: List[str] = []
+        for start in range(0, len(passwords), self.workers):
+            chunk = passwords[start : start + self.workers]
+            started = time.perf_counter()
+            with self._lock:
+                self._in_flight += len(chunk)
+            try:
+                hashes.extend(executor.map(_bcrypt_hash, chunk))
+            finally:
+                elapsed = time.perf_counter() - started
+                with self._lock:
+                    self._in_flight -= len(chunk)
+                    self._completed += len(chunk)
+                    self._total_latency += elapsed * len(chunk)
+                    self._max_latency = max(self._max_latency, elapsed)
+        return hashes
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            average = self._total_latency / self._completed if self._completed else 0.0
+            return {
+                "executor": self.executor_type,
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "in_flight": self._in_flight,
+                "queue_depth": max(0, self._in_flight - self.workers),
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_latency_ms": round(average * 1000, 2),
+                "max_latency_ms": round(self._max_latency * 1000, 2),
+            }
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+    executor=settings.PASSWORD_HASH_EXECUTOR,
+    retry_after=settings.PASSWORD_HASH_RETRY_AFTER,
+)
+
+
+def hash_password(password: str) -> str:
+    return password_hasher.hash(password)
+
+
+def verify_password(password: str, hashed_password: str) -> bool:
+    return password_hasher.verify(password, hashed_password)
+
+
 def create_access_token(data: dict):
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(days=7)
+    expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
-async def get_current_user(
+def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db),
-):
+) -> AuthenticatedUser:
     try:
         payload = jwt.decode(
             credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM]
@@ -423,13 +1389,36 @@ async def get_current_user(
             status_code=401, detail="Invalid authentication credentials"
         )
 
-    user = db.query(User).filter(User.id == user_id).first()
-    if user is None:
-        raise HTTPException(status_code=401, detail="User not found")
-    return user
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        row = (
+            db.query(User.id, User.role, User.is_active, Club.name)
+            .outerjoin(Club, User.club_id == Club.id)
+            .filter(User.id == user_id)
+            .first()
+        )
+        if row is None:
+            raise HTTPException(status_code=401, detail="User not found")
+        principal = AuthenticatedUser(
+            id=row.id, role=row.role, is_active=row.is_active, club=row.name
+        )
+        principal_cache.set(user_id, principal)
+    # Tokens outlive deactivation, so the flag is checked on every request
+    if not principal.is_active:
+        raise HTTPException(status_code=401, detail="Account is disabled")
+    return principal
 
 
 # Helper functions
+def query_users_with_club(db: Session):
+    """Query users with their club name joined in.
+
+    user_to_response reads ``user.club``; loading it eagerly keeps a page of
+    users to a single query instead of one extra lazy load per row.
+    """
+    return db.query(User).options(joinedload(User.club).load_only(Club.name))
+
+
 def user_to_response(user: User) -> UserResponse:
     return UserResponse(
         id=user.id,
@@ -450,33 +1439,618 @@ def user_to_response(user: User) -> UserResponse:
     )
 
 
-# API Endpoints
+def encode_cursor(values: List[Any]) -> str:
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
 
 
-# Health check
-@app.get("/")
-async def root():
-    return {"message": "DSRFA Backend API", "version": "1.2.5", "status": "healthy"}
+def decode_cursor(cursor: str, sort_keys) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(sort_keys):
+            raise ValueError(cursor)
+        return [
+            datetime.fromisoformat(value) if isinstance(key.type, DateTime) else value
+            for key, value in zip(sort_keys, values)
+        ]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def paginate(query, sort_keys, skip: int, limit: int, cursor: Optional[str]):
+    """Order ``query`` by ``sort_keys`` and fetch one page of rows.
+
+    Without a cursor this is classic offset paging. With a cursor (an empty
+    string requests the first page) rows are fetched with a keyset condition
+    on ``sort_keys``, so every page costs the same regardless of depth.
+    Returns the rows and the cursor of the next page, if any.
+    """
+    limit = max(1, min(limit, settings.MAX_PAGE_SIZE))
+    query = query.order_by(*sort_keys)
+
+    if cursor is None:
+        return query.offset(skip).limit(limit).all(), None
+
+    if cursor:
+        after = decode_cursor(cursor, sort_keys)
+        query = query.filter(tuple_(*sort_keys) > tuple_(*after))
+
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([getattr(rows[-1], key.key) for key in sort_keys])
+    return rows, next_cursor
+
+
+def page_response(items: List[Any], cursor: Optional[str], next_cursor: Optional[str]):
+    # Offset mode keeps the original bare-list response.
+    if cursor is None:
+        return items
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def parse_fields(fields: Optional[str], response_model) -> Optional[List[str]]:
+    """Validate a ``fields=`` selection against the endpoint's response model.
+
+    Returns the selected names in response-model order, always including
+    ``id``, or ``None`` when no selection was requested.
+    """
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(",")} - {""}
+    unknown = requested - response_model.model_fields.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    return [
+        name
+        for name in response_model.model_fields
+        if name == "id" or name in requested
+    ]
 
 
-# Authentication endpoints
-@app.post("/auth/register")
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
-    # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
-    if existing_user:
-        raise HTTPException(status_code=400, detail="Email already registered")
+def load_fields(query, model, names: List[str], sort_keys):
+    """Restrict ``query`` to the columns behind ``names`` plus the sort keys."""
+    column_names = model.__mapper__.column_attrs.keys()
+    derived_columns = getattr(model, "derived_columns", {})
+    columns = {key.key: key for key in sort_keys}
+    for name in names:
+        if name in column_names:
+            columns[name] = getattr(model, name)
+        for column_name in derived_columns.get(name, []):
+            columns[column_name] = getattr(model, column_name)
+    return query.options(load_only(*columns.values()))
+
+
+def sparse_response(
+    rows,
+    names: List[str],
+    cursor: Optional[str],
+    next_cursor: Optional[str],
+    response: Optional[Response] = None,
+    getters: Optional[Dict[str, Any]] = None,
+) -> ORJSONResponse:
+    """Render only ``names`` of each row.
+
+    Partial items do not satisfy the endpoint's response model, so the page is
+    rendered directly, carrying over any headers set on ``response``.
+    """
+    getters = getters or {}
+    items = [
+        {
+            name: getters[name](row) if name in getters else getattr(row, name)
+            for name in names
+        }
+        for row in rows
+    ]
+    return ORJSONResponse(
+        page_response(items, cursor, next_cursor),
+        headers=response.headers if response is not None else None,
+    )
 
-    # Create new user
-    hashed_password = hash_password(user_data.password)
-    new_user = User(
-        name=user_data.name,
-        email=user_data.email,
-        password_hash=hashed_password,
+
+def export_response(
+    statement, export_format: ExportFormat, name: str, session_factory
+) -> StreamingResponse:
+    """Stream the rows of ``statement`` as a CSV or NDJSON download.
+
+    Rows are fetched EXPORT_BATCH_SIZE at a time through a server-side cursor
+    on a session from ``session_factory`` owned by the stream, so memory use
+    does not grow with the size of the export.
+    """
+
+    def generate():
+        db = session_factory()
+        try:
+            result = db.execute(
+                statement.execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+            )
+            columns = list(result.keys())
+            if export_format == ExportFormat.NDJSON:
+                for rows in result.partitions():
+                    yield b"".join(
+                        orjson.dumps(dict(zip(columns, row))) + b"\n" for row in rows
+                    )
+                return
+
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+            for rows in result.partitions():
+                writer.writerows(
+                    [
+                        value.isoformat() if isinstance(value, datetime) else value
+                        for value in row
+                    ]
+                    for row in rows
+                )
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue().encode("utf-8")
+        finally:
+            db.close()
+
+    media_type = {
+        ExportFormat.CSV: "text/csv",
+        ExportFormat.NDJSON: "application/x-ndjson",
+    }[export_format]
+    filename = f"{name}-{datetime.utcnow():%Y%m%d%H%M%S}.{export_format.value}"
+    return StreamingResponse(
+        generate(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+# entity type, title attribute and body attributes of each searchable model
+SEARCH_FIELDS = {
+    User: ("user", "name", ("email",)),
+    Club: ("club", "name", ("location",)),
+    Event: ("event", "title", ("description", "venue")),
+}
+SEARCH_TYPES = {entity_type for entity_type, _, _ in SEARCH_FIELDS.values()}
+
+SQLITE_SEARCH = text(
+    """
+    SELECT d.entity_type, d.entity_id, d.title,
+           -bm25(search_index, 10.0, 1.0) AS score
+    FROM search_index
+    JOIN search_documents AS d ON d.id = search_index.rowid
+    WHERE search_index MATCH :query AND d.entity_type IN :types
+    ORDER BY bm25(search_index, 10.0, 1.0)
+    LIMIT :limit
+    """
+).bindparams(bindparam("types", expanding=True))
+
+POSTGRESQL_SEARCH = text(
+    """
+    SELECT d.entity_type, d.entity_id, d.title,
+           ts_rank(d.document, to_tsquery('simple', :query)) AS score
+    FROM search_documents AS d
+    WHERE d.document @@ to_tsquery('simple', :query) AND d.entity_type IN :types
+    ORDER BY score DESC
+    LIMIT :limit
+    """
+).bindparams(bindparam("types", expanding=True))
+
+
+def search_document(target) -> Dict[str, Any]:
+    entity_type, title_field, body_fields = SEARCH_FIELDS[type(target)]
+    return {
+        "entity_type": entity_type,
+        "entity_id": target.id,
+        "title": getattr(target, title_field) or "",
+        "body": " ".join(filter(None, (getattr(target, f) for f in body_fields))),
+    }
+
+
+def upsert_search_documents(connection, documents: List[Dict[str, Any]]):
+    """Insert or refresh search documents on ``connection``.
+
+    Runs in the caller's transaction; the full-text index follows the table
+    through triggers (SQLite) or a generated column (PostgreSQL).
+    """
+    if not documents:
+        return
+    dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+    table = SearchDocument.__table__
+    stmt = dialect.insert(table).values(documents)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.entity_type, table.c.entity_id],
+        set_={"title": stmt.excluded.title, "body": stmt.excluded.body},
+    )
+    connection.execute(stmt)
+
+
+def _index_inserted(mapper, connection, target):
+    upsert_search_documents(connection, [search_document(target)])
+
+
+def _index_updated(mapper, connection, target):
+    _, title_field, body_fields = SEARCH_FIELDS[type(target)]
+    attrs = inspect(target).attrs
+    # Logins and status changes flush users constantly; skip those.
+    if any(attrs[name].history.has_changes() for name in (title_field, *body_fields)):
+        upsert_search_documents(connection, [search_document(target)])
+
+
+def _unindex_deleted(mapper, connection, target):
+    table = SearchDocument.__table__
+    connection.execute(
+        delete(table).where(
+            table.c.entity_type == SEARCH_FIELDS[type(target)][0],
+            table.c.entity_id == target.id,
+        )
+    )
+
+
+for _model in SEARCH_FIELDS:
+    listen(_model, "after_insert", _index_inserted)
+    listen(_model, "after_update", _index_updated)
+    listen(_model, "after_delete", _unindex_deleted)
+
+
+def search_documents(db: Session, terms: List[str], types: List[str], limit: int):
+    """Rank documents of ``types`` matching every term as a prefix."""
+    if db.get_bind().dialect.name == "postgresql":
+        statement = POSTGRESQL_SEARCH
+        query = " & ".join(f"{term}:*" for term in terms)
+    else:
+        statement = SQLITE_SEARCH
+        query = " ".join(f'"{term}"*' for term in terms)
+    return db.execute(statement, {"query": query, "types": types, "limit": limit}).all()
+
+
+def read_csv_rows(rows: Iterable[Dict[str, Any]]):
+    """Yield (line number, row) with normalised headers and blanks dropped."""
+    for line, row in enumerate(rows, start=2):
+        yield line, {
+            key.strip().lower(): value.strip()
+            for key, value in row.items()
+            if key and isinstance(value, str) and value.strip()
+        }
+
+
+def batched(items: Iterable[Any], size: int):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in exc.errors()
+    )
+
+
+def import_members(
+    db: Session,
+    rows: Iterable[Dict[str, Any]],
+    hasher: PasswordHasher,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    """Validate and insert member rows from a CSV reader.
+
+    Each IMPORT_BATCH_SIZE batch costs one duplicate-email query, one club
+    lookup, a parallel round of password hashing and one multi-row INSERT.
+    Invalid rows are reported by line and skipped; the rest commit together.
+    A dry run only validates, skipping the hashing and the INSERT.
+    """
+    total, created, errors = 0, 0, []
+    seen_emails = set()
+    for batch in batched(read_csv_rows(rows), settings.IMPORT_BATCH_SIZE):
+        total += len(batch)
+        valid = []
+        for line, row in batch:
+            try:
+                member = MemberImportRow(**row)
+            except ValidationError as exc:
+                errors.append({"line": line, "error": validation_message(exc)})
+                continue
+            if member.email in seen_emails:
+                errors.append({"line": line, "error": "Duplicate email in file"})
+                continue
+            seen_emails.add(member.email)
+            valid.append((line, member))
+
+        emails = [member.email for _, member in valid]
+        registered = set(
+            db.execute(select(User.email).where(User.email.in_(emails))).scalars()
+        )
+        # ``club`` (name or id) and ``club_id`` go through the same lookup
+        references = {
+            member.club or member.club_id
+            for _, member in valid
+            if member.club or member.club_id
+        }
+        clubs = {}
+        if references:
+            for club_id, club_name in db.execute(
+                select(Club.id, Club.name).where(
+                    or_(Club.id.in_(references), Club.name.in_(references))
+                )
+            ):
+                clubs[club_id] = club_id
+                clubs[club_name] = club_id
+
+        accepted = []
+        for line, member in valid:
+            reference = member.club or member.club_id
+            if member.email in registered:
+                errors.append({"line": line, "error": "Email already registered"})
+            elif reference and reference not in clubs:
+                errors.append({"line": line, "error": f"Unknown club: {reference}"})
+            else:
+                accepted.append(member)
+        if dry_run:
+            created += len(accepted)
+            continue
+        if not accepted:
+            continue
+
+        hashes = hasher.hash_many([member.password for member in accepted])
+        now = datetime.utcnow()
+        values = []
+        for member, password_hash in zip(accepted, hashes):
+            data = member.dict(exclude={"password", "club"})
+            data.update(
+                id=str(uuid.uuid4()),
+                password_hash=password_hash,
+                club_id=clubs.get(member.club or member.club_id),
+                membership_expiry=now + timedelta(days=365),
+                created_at=now,
+                updated_at=now,
+                is_active=True,
+            )
+            values.append(data)
+        # Bulk inserts bypass the mapper events that maintain search documents
+        db.execute(insert(User), values)
+        upsert_search_documents(
+            db.connection(),
+            [search_document(User(**data)) for data in values],
+        )
+        created += len(values)
+
+    if dry_run:
+        db.rollback()
+    else:
+        db.commit()
+        dashboard_cache.clear()
+    errors.sort(key=lambda error: error["line"])
+    return {
+        "kind": "members",
+        "total": total,
+        "created": created,
+        "dry_run": dry_run,
+        "errors": errors,
+    }
+
+
+def import_clubs(
+    db: Session, rows: Iterable[Dict[str, Any]], dry_run: bool = False
+) -> Dict[str, Any]:
+    """Validate and insert club rows from a CSV reader, one INSERT per batch.
+
+    Rows naming a club that already exists (or appears earlier in the file)
+    are reported and skipped.
+    """
+    total, created, errors = 0, 0, []
+    seen_names = set()
+    for batch in batched(read_csv_rows(rows), settings.IMPORT_BATCH_SIZE):
+        total += len(batch)
+        valid = []
+        for line, row in batch:
+            try:
+                club = ClubCreate(**row)
+            except ValidationError as exc:
+                errors.append({"line": line, "error": validation_message(exc)})
+                continue
+            if club.name in seen_names:
+                errors.append({"line": line, "error": "Duplicate club in file"})
+                continue
+            seen_names.add(club.name)
+            valid.append((line, club))
+
+        names = [club.name for _, club in valid]
+        existing = set(
+            db.execute(select(Club.name).where(Club.name.in_(names))).scalars()
+        )
+        now = datetime.utcnow()
+        values = []
+        for line, club in valid:
+            if club.name in existing:
+                errors.append({"line": line, "error": "Club already exists"})
+                continue
+            values.append(
+                {
+                    **club.dict(),
+                    "id": str(uuid.uuid4()),
+                    "created_at": now,
+                    "updated_at": now,
+                    "is_active": True,
+                }
+            )
+        if not values:
+            continue
+
+        db.execute(insert(Club), values)
+        upsert_search_documents(
+            db.connection(),
+            [search_document(Club(**data)) for data in values],
+        )
+        created += len(values)
+
+    if dry_run:
+        db.rollback()
+    else:
+        db.commit()
+        dashboard_cache.clear()
+    errors.sort(key=lambda error: error["line"])
+    return {
+        "kind": "clubs",
+        "total": total,
+        "created": created,
+        "dry_run": dry_run,
+        "errors": errors,
+    }
+
+
+def apply_payment_rollup(
+    db: Session,
+    payment: Payment,
+    old_status: Optional[str],
+    new_status: Optional[str],
+):
+    """Move ``payment`` between rollup buckets for a status change.
+
+    Runs inside the caller's transaction so the rollup commits or rolls back
+    together with the payment row.
+    """
+    deltas = {
+        "completed_amount": 0.0,
+        "completed_count": 0,
+        "refunded_amount": 0.0,
+        "refunded_count": 0,
+    }
+    for status_value, sign in ((old_status, -1), (new_status, 1)):
+        if status_value == PaymentStatus.COMPLETED:
+            deltas["completed_amount"] += sign * payment.amount
+            deltas["completed_count"] += sign
+        elif status_value == PaymentStatus.REFUNDED:
+            deltas["refunded_amount"] += sign * payment.amount
+            deltas["refunded_count"] += sign
+
+    if not any(deltas.values()):
+        return
+
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    table = PaymentMonthlyRollup.__table__
+    stmt = dialect.insert(table).values(
+        month=(payment.payment_date or datetime.utcnow()).strftime("%Y-%m"),
+        payment_type=payment.payment_type or "other",
+        updated_at=datetime.utcnow(),
+        **deltas,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.month, table.c.payment_type],
+        set_={
+            **{name: table.c[name] + stmt.excluded[name] for name in deltas},
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    db.execute(stmt)
+
+
+def parse_month(value: str) -> str:
+    try:
+        return datetime.strptime(value, "%Y-%m").strftime("%Y-%m")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Months must use YYYY-MM")
+
+
+def shift_month(month: str, offset: int) -> str:
+    year, month_number = map(int, month.split("-"))
+    index = year * 12 + (month_number - 1) + offset
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def make_etag(*parts: Any) -> str:
+    digest = hashlib.sha1("|".join(map(str, parts)).encode("utf-8")).hexdigest()
+    # Weak: the representation is equivalent across content encodings.
+    return f'W/"{digest}"'
+
+
+def list_etag(request: Request, query, version_column, *extra) -> tuple:
+    """ETag and Last-Modified for a filtered list query.
+
+    Derived from the newest ``version_column`` value and the row count of the
+    whole filtered set (so inserts, edits and deletes all change it), plus the
+    query string so each page and filter combination has its own tag. Any
+    ``extra`` aggregates are folded into the tag as well, for changes that do
+    not touch ``version_column``.
+    """
+    newest, total, *rest = query.with_entities(
+        func.max(version_column), func.count(), *extra
+    ).one()
+    etag = make_etag(request.url.path, request.url.query, newest, total, *rest)
+    return etag, newest
+
+
+def conditional_get(
+    request: Request,
+    response: Response,
+    etag: str,
+    last_modified: Optional[datetime],
+) -> Optional[Response]:
+    """Attach cache validators and answer 304 when the client copy is current.
+
+    Returns the 304 response to send, or ``None`` after setting the headers on
+    ``response`` so the caller can render the full body.
+    """
+    headers = {"ETag": etag, "Cache-Control": settings.CATALOG_CACHE_CONTROL}
+    if last_modified is not None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc, microsecond=0)
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        client_tags = {
+            tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+        }
+        not_modified = "*" in client_tags or etag.removeprefix("W/") in client_tags
+    elif last_modified is not None and "if-modified-since" in request.headers:
+        try:
+            since = parsedate_to_datetime(request.headers["if-modified-since"])
+            not_modified = last_modified <= since
+        except (TypeError, ValueError):
+            not_modified = False
+    else:
+        not_modified = False
+
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
+# API Endpoints
+
+
+# Health check
+@router.get("/")
+async def root():
+    return {"message": "DSRFA Backend API", "version": "1.2.5", "status": "healthy"}
+
+
+# Authentication endpoints
+@router.post("/auth/register")
+def register(user_data: UserCreate, db: Session = Depends(get_db)):
+    # Check if user already exists
+    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    if existing_user:
+        raise HTTPException(status_code=400, detail="Email already registered")
+
+    # Create new user
+    hashed_password = hash_password(user_data.password)
+    new_user = User(
+        name=user_data.name,
+        email=user_data.email,
+        password_hash=hashed_password,
         phone=user_data.phone,
         address=user_data.address,
         role=user_data.role,
-        club_id=user_data.club_id,
+        club_id=user_data.club_id or None,
         position=user_data.position,
         bio=user_data.bio,
         emergency_contact=user_data.emergency_contact,
@@ -485,15 +2059,21 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     )
 
     db.add(new_user)
-    db.commit()
+    # Foreign keys are enforced on SQLite as well as PostgreSQL
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Unknown club")
+    dashboard_cache.clear()
     db.refresh(new_user)
 
     return {"message": "User registered successfully", "user_id": new_user.id}
 
 
-@app.post("/auth/login")
-async def login(login_data: UserLogin, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == login_data.email).first()
+@router.post("/auth/login")
+def login(login_data: UserLogin, db: Session = Depends(get_db)):
+    user = query_users_with_club(db).filter(User.email == login_data.email).first()
 
     if not user or not verify_password(login_data.password, user.password_hash):
         raise HTTPException(status_code=401, detail="Invalid email or password")
@@ -501,55 +2081,112 @@ async def login(login_data: UserLogin, db: Session = Depends(get_db)):
     if not user.is_active:
         raise HTTPException(status_code=401, detail="Account is disabled")
 
-    # Update last login
+    # Update last login. The response is built first because commit expires
+    # the instance and reading it afterwards would reload the row and club.
     user.last_login = datetime.utcnow()
-    db.commit()
-
+    user_response = user_to_response(user)
     access_token = create_access_token({"sub": user.id})
+    db.commit()
 
     return {
         "access_token": access_token,
         "token_type": "bearer",
-        "user": user_to_response(user),
+        "user": user_response,
     }
 
 
-@app.get("/auth/me")
-async def get_current_user_info(current_user: User = Depends(get_current_user)):
-    return user_to_response(current_user)
+@router.get("/auth/me", response_model=UserResponse)
+def get_current_user_info(
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    user = query_users_with_club(db).filter(User.id == current_user.id).first()
+    if user is None:
+        raise HTTPException(status_code=401, detail="User not found")
+    return user_to_response(user)
 
 
 # User management endpoints
-@app.get("/users")
-async def get_users(
+@router.get("/users", response_model=UserListResponse)
+def get_users(
     skip: int = 0,
     limit: int = 100,
     role: Optional[str] = None,
     status: Optional[str] = None,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
 ):
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Admin access required")
 
-    query = db.query(User)
+    field_names = parse_fields(fields, UserResponse)
+    sort_keys = [User.created_at, User.id]
+    if field_names is None or "club" in field_names:
+        query = query_users_with_club(db)
+    else:
+        query = db.query(User)
+    if field_names is not None:
+        query = load_fields(query, User, field_names, sort_keys)
 
     if role:
         query = query.filter(User.role == role)
     if status:
         query = query.filter(User.membership_status == status)
 
-    users = query.offset(skip).limit(limit).all()
-    return [user_to_response(user) for user in users]
+    users, next_cursor = paginate(query, sort_keys, skip, limit, cursor)
+    if field_names is not None:
+        return sparse_response(
+            users,
+            field_names,
+            cursor,
+            next_cursor,
+            getters={"club": lambda user: user.club.name if user.club else None},
+        )
+    return page_response(
+        [user_to_response(user) for user in users], cursor, next_cursor
+    )
+
+
+@router.get("/users/export")
+def export_users(
+    request: Request,
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format"),
+    role: Optional[str] = None,
+    status: Optional[str] = None,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    columns = [
+        Club.name.label("club") if name == "club" else getattr(User, name)
+        for name in UserResponse.model_fields
+    ]
+    statement = (
+        select(*columns)
+        .select_from(User)
+        .outerjoin(Club, User.club_id == Club.id)
+        .order_by(User.created_at, User.id)
+    )
+    if role:
+        statement = statement.where(User.role == role)
+    if status:
+        statement = statement.where(User.membership_status == status)
+
+    return export_response(
+        statement, export_format, "members", read_session_factory(request)
+    )
 
 
-@app.get("/users/{user_id}")
-async def get_user(
+@router.get("/users/{user_id}", response_model=UserResponse)
+def get_user(
     user_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
 ):
-    user = db.query(User).filter(User.id == user_id).first()
+    user = query_users_with_club(db).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -560,11 +2197,11 @@ async def get_user(
     return user_to_response(user)
 
 
-@app.put("/users/{user_id}")
-async def update_user(
+@router.put("/users/{user_id}", response_model=UserResponse)
+def update_user(
     user_id: str,
     user_data: dict,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     user = db.query(User).filter(User.id == user_id).first()
@@ -581,16 +2218,24 @@ async def update_user(
             setattr(user, field, value)
 
     user.updated_at = datetime.utcnow()
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=400, detail="Unknown club or email already registered"
+        )
     db.refresh(user)
+    principal_cache.pop(user_id)
+    dashboard_cache.clear()
 
     return user_to_response(user)
 
 
-@app.post("/users/{user_id}/approve")
-async def approve_user(
+@router.post("/users/{user_id}/approve")
+def approve_user(
     user_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     if current_user.role != UserRole.ADMIN:
@@ -603,14 +2248,16 @@ async def approve_user(
     user.membership_status = MembershipStatus.ACTIVE
     user.updated_at = datetime.utcnow()
     db.commit()
+    dashboard_cache.clear()
+    principal_cache.pop(user_id)
 
     return {"message": "User approved successfully"}
 
 
-@app.post("/users/{user_id}/reject")
-async def reject_user(
+@router.post("/users/{user_id}/reject")
+def reject_user(
     user_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     if current_user.role != UserRole.ADMIN:
@@ -623,63 +2270,242 @@ async def reject_user(
     user.membership_status = MembershipStatus.INACTIVE
     user.updated_at = datetime.utcnow()
     db.commit()
+    dashboard_cache.clear()
+    principal_cache.pop(user_id)
 
     return {"message": "User rejected successfully"}
 
 
+# Column values written by each bulk action
+BULK_USER_ACTIONS = {
+    BulkUserAction.APPROVE: {"membership_status": MembershipStatus.ACTIVE},
+    BulkUserAction.REJECT: {"membership_status": MembershipStatus.INACTIVE},
+    BulkUserAction.EXPIRE: {"membership_status": MembershipStatus.EXPIRED},
+    BulkUserAction.DEACTIVATE: {"is_active": False},
+}
+
+
+@router.post("/users/bulk", response_model=BulkUserResult)
+def bulk_update_users(
+    bulk: BulkUserUpdate,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    if (bulk.ids is None) == (bulk.filter is None):
+        raise HTTPException(
+            status_code=400, detail="Provide either ids or filter, not both"
+        )
+    if bulk.ids is not None and len(bulk.ids) > settings.BULK_MAX_IDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.BULK_MAX_IDS} ids per request",
+        )
+    # An empty filter would match every member
+    if bulk.filter is not None and not bulk.filter.model_dump(exclude_none=True):
+        raise HTTPException(
+            status_code=400, detail="Filter must have at least one criterion"
+        )
+
+    values = BULK_USER_ACTIONS[bulk.action]
+    # Rows already in the target state are left alone (and reported unchanged)
+    conditions = [
+        or_(getattr(User, name).is_(None), getattr(User, name) != value)
+        for name, value in values.items()
+    ]
+    # An admin cannot reject, expire or deactivate their own account
+    if bulk.action != BulkUserAction.APPROVE:
+        conditions.append(User.id != current_user.id)
+
+    if bulk.ids is not None:
+        ids = list(dict.fromkeys(bulk.ids))
+        conditions.append(User.id.in_(ids))
+    else:
+        if bulk.filter.role:
+            conditions.append(User.role == bulk.filter.role)
+        if bulk.filter.status:
+            conditions.append(User.membership_status == bulk.filter.status)
+        if bulk.filter.club_id:
+            conditions.append(User.club_id == bulk.filter.club_id)
+        if bulk.filter.expires_before:
+            conditions.append(User.membership_expiry < bulk.filter.expires_before)
+
+    statement = (
+        update(User)
+        .where(*conditions)
+        .values(**values, updated_at=datetime.utcnow())
+        .returning(User.id)
+        .execution_options(synchronize_session=False)
+    )
+    updated = db.execute(statement).scalars().all()
+
+    outcomes = {user_id: "updated" for user_id in updated}
+    if bulk.ids is not None:
+        remaining = [user_id for user_id in ids if user_id not in outcomes]
+        existing = set()
+        if remaining:
+            existing = set(
+                db.execute(select(User.id).where(User.id.in_(remaining))).scalars()
+            )
+        for user_id in remaining:
+            if user_id not in existing:
+                outcomes[user_id] = "not_found"
+            elif user_id == current_user.id and bulk.action != BulkUserAction.APPROVE:
+                outcomes[user_id] = "skipped"
+            else:
+                outcomes[user_id] = "unchanged"
+        ordered = ids
+    else:
+        ordered = updated
+
+    db.commit()
+    if updated:
+        dashboard_cache.clear()
+        for user_id in updated:
+            principal_cache.pop(user_id)
+
+    return {
+        "action": bulk.action,
+        "updated": len(updated),
+        "results": [
+            {"id": user_id, "outcome": outcomes[user_id]} for user_id in ordered
+        ],
+    }
+
+
+# Bulk import endpoints
+def open_csv_upload(file: UploadFile):
+    if not (file.filename or "").lower().endswith(".csv"):
+        raise HTTPException(status_code=400, detail="Upload a .csv file")
+    # utf-8-sig drops the byte order mark spreadsheet exports often start with
+    return csv.DictReader(io.TextIOWrapper(file.file, encoding="utf-8-sig", newline=""))
+
+
+@router.post("/import/members", response_model=ImportReport)
+def import_members_csv(
+    file: UploadFile = File(...),
+    dry_run: bool = False,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    try:
+        return import_members(db, open_csv_upload(file), password_hasher, dry_run)
+    except UnicodeDecodeError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="CSV must be UTF-8 encoded")
+
+
+@router.post("/import/clubs", response_model=ImportReport)
+def import_clubs_csv(
+    file: UploadFile = File(...),
+    dry_run: bool = False,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    try:
+        return import_clubs(db, open_csv_upload(file), dry_run)
+    except UnicodeDecodeError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="CSV must be UTF-8 encoded")
+
+
 # Club management endpoints
-@app.get("/clubs")
-async def get_clubs(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    clubs = (
-        db.query(Club).filter(Club.is_active == True).offset(skip).limit(limit).all()
+@router.get("/clubs", response_model=ClubListResponse)
+def get_clubs(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+):
+    field_names = parse_fields(fields, ClubResponse)
+    sort_keys = [Club.created_at, Club.id]
+    query = db.query(Club).filter(Club.is_active == True)
+
+    not_modified = conditional_get(
+        request, response, *list_etag(request, query, Club.updated_at)
     )
-    return clubs
+    if not_modified:
+        return not_modified
 
+    if field_names is not None:
+        query = load_fields(query, Club, field_names, sort_keys)
+    clubs, next_cursor = paginate(query, sort_keys, skip, limit, cursor)
+    if field_names is not None:
+        return sparse_response(clubs, field_names, cursor, next_cursor, response)
+    return page_response(clubs, cursor, next_cursor)
 
-@app.post("/clubs")
-async def create_club(
+
+@router.post("/clubs", response_model=ClubResponse)
+def create_club(
     club_data: ClubCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     new_club = Club(**club_data.dict())
     db.add(new_club)
     db.commit()
+    dashboard_cache.clear()
     db.refresh(new_club)
     return new_club
 
 
-@app.get("/clubs/{club_id}")
-async def get_club(club_id: str, db: Session = Depends(get_db)):
+@router.get("/clubs/{club_id}", response_model=ClubResponse)
+def get_club(
+    club_id: str,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+):
     club = db.query(Club).filter(Club.id == club_id).first()
     if not club:
         raise HTTPException(status_code=404, detail="Club not found")
+
+    etag = make_etag(request.url.path, club.updated_at)
+    not_modified = conditional_get(request, response, etag, club.updated_at)
+    if not_modified:
+        return not_modified
     return club
 
 
-@app.get("/clubs/{club_id}/members")
-async def get_club_members(
+@router.get("/clubs/{club_id}/members", response_model=List[UserResponse])
+def get_club_members(
     club_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
 ):
     club = db.query(Club).filter(Club.id == club_id).first()
     if not club:
         raise HTTPException(status_code=404, detail="Club not found")
 
-    members = db.query(User).filter(User.club_id == club_id).all()
+    members = query_users_with_club(db).filter(User.club_id == club_id).all()
     return [user_to_response(member) for member in members]
 
 
 # Event management endpoints
-@app.get("/events")
-async def get_events(
+@router.get("/events", response_model=EventListResponse)
+def get_events(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     category: Optional[str] = None,
     status: Optional[str] = None,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_read_db),
 ):
+    field_names = parse_fields(fields, EventResponse)
+    sort_keys = [Event.created_at, Event.id]
     query = db.query(Event)
 
     if category:
@@ -687,14 +2513,24 @@ async def get_events(
     if status:
         query = query.filter(Event.status == status)
 
-    events = query.offset(skip).limit(limit).all()
-    return events
+    not_modified = conditional_get(
+        request, response, *list_etag(request, query, Event.updated_at)
+    )
+    if not_modified:
+        return not_modified
+
+    if field_names is not None:
+        query = load_fields(query, Event, field_names, sort_keys)
+    events, next_cursor = paginate(query, sort_keys, skip, limit, cursor)
+    if field_names is not None:
+        return sparse_response(events, field_names, cursor, next_cursor, response)
+    return page_response(events, cursor, next_cursor)
 
 
-@app.post("/events")
-async def create_event(
+@router.post("/events", response_model=EventResponse)
+def create_event(
     event_data: EventCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     if current_user.role not in [UserRole.ADMIN, UserRole.CLUB_OWNER]:
@@ -702,26 +2538,46 @@ async def create_event(
             status_code=403, detail="Admin or Club Owner access required"
         )
 
-    new_event = Event(**event_data.dict(), created_by=current_user.id)
+    new_event = Event(
+        **event_data.dict(exclude={"organizing_club_id"}),
+        organizing_club_id=event_data.organizing_club_id or None,
+        created_by=current_user.id,
+    )
     db.add(new_event)
-    db.commit()
+    # Foreign keys are enforced on SQLite as well as PostgreSQL
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Unknown organizing club")
+    dashboard_cache.clear()
     db.refresh(new_event)
     return new_event
 
 
-@app.get("/events/{event_id}")
-async def get_event(event_id: str, db: Session = Depends(get_db)):
+@router.get("/events/{event_id}", response_model=EventResponse)
+def get_event(
+    event_id: str,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+):
     event = db.query(Event).filter(Event.id == event_id).first()
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
+
+    etag = make_etag(request.url.path, event.updated_at)
+    not_modified = conditional_get(request, response, etag, event.updated_at)
+    if not_modified:
+        return not_modified
     return event
 
 
-@app.put("/events/{event_id}")
-async def update_event(
+@router.put("/events/{event_id}", response_model=EventResponse)
+def update_event(
     event_id: str,
     event_data: dict,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     event = db.query(Event).filter(Event.id == event_id).first()
@@ -733,71 +2589,94 @@ async def update_event(
         raise HTTPException(status_code=403, detail="Permission denied")
 
     for field, value in event_data.items():
-        if hasattr(event, field):
+        # registered_count is maintained by seat reservations only
+        if hasattr(event, field) and field != "registered_count":
             setattr(event, field, value)
 
     event.updated_at = datetime.utcnow()
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Unknown organizing club")
+    dashboard_cache.clear()
     db.refresh(event)
     return event
 
 
 # Event registration endpoints
-@app.post("/events/{event_id}/register")
-async def register_for_event(
+@router.post("/events/{event_id}/register")
+def register_for_event(
     event_id: str,
     registration_data: EventRegistrationCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
-
-    if event.status != EventStatus.OPEN:
-        raise HTTPException(status_code=400, detail="Event registration is closed")
-
-    # Check if already registered
-    existing_registration = (
-        db.query(EventRegistration)
-        .filter(
-            EventRegistration.event_id == event_id,
-            EventRegistration.user_id == current_user.id,
+    # Take a seat with one conditional UPDATE. It only matches while the event
+    # is open and below capacity, so concurrent signups cannot oversell it, and
+    # the last seat flips the status to Full in the same statement.
+    seat_reserved = db.execute(
+        update(Event)
+        .where(
+            Event.id == event_id,
+            Event.status == EventStatus.OPEN,
+            or_(
+                Event.max_participants.is_(None),
+                Event.registered_count < Event.max_participants,
+            ),
         )
-        .first()
-    )
-
-    if existing_registration:
-        raise HTTPException(status_code=400, detail="Already registered for this event")
-
-    # Check capacity
-    current_participants = (
-        db.query(EventRegistration)
-        .filter(EventRegistration.event_id == event_id)
-        .count()
-    )
-    if current_participants >= event.max_participants:
+        .values(
+            registered_count=Event.registered_count + 1,
+            status=case(
+                (
+                    Event.registered_count + 1 >= Event.max_participants,
+                    EventStatus.FULL.value,
+                ),
+                else_=Event.status,
+            ),
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+    if not seat_reserved:
+        event = db.query(Event.status).filter(Event.id == event_id).first()
+        if not event:
+            raise HTTPException(status_code=404, detail="Event not found")
+        if event.status not in (EventStatus.OPEN, EventStatus.FULL):
+            raise HTTPException(status_code=400, detail="Event registration is closed")
         raise HTTPException(status_code=400, detail="Event is full")
 
     new_registration = EventRegistration(
-        **registration_data.dict(), user_id=current_user.id
+        **registration_data.dict(exclude={"event_id"}),
+        event_id=event_id,
+        user_id=current_user.id,
     )
-
     db.add(new_registration)
+
+    # The unique (event_id, user_id) index rejects duplicates; rolling back
+    # also releases the seat taken above.
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Already registered for this event")
+
+    registration_id = new_registration.id
     db.commit()
-    db.refresh(new_registration)
 
     return {
         "message": "Registered successfully",
-        "registration_id": new_registration.id,
+        "registration_id": registration_id,
     }
 
 
-@app.get("/events/{event_id}/registrations")
-async def get_event_registrations(
+@router.get(
+    "/events/{event_id}/registrations", response_model=List[EventRegistrationResponse]
+)
+def get_event_registrations(
     event_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
 ):
     event = db.query(Event).filter(Event.id == event_id).first()
     if not event:
@@ -813,16 +2692,57 @@ async def get_event_registrations(
     return registrations
 
 
+@router.get("/events/{event_id}/registrations/export")
+def export_event_registrations(
+    event_id: str,
+    request: Request,
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format"),
+    status: Optional[str] = None,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+):
+    event = db.query(Event).filter(Event.id == event_id).first()
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+
+    if current_user.role != UserRole.ADMIN and event.created_by != current_user.id:
+        raise HTTPException(status_code=403, detail="Permission denied")
+
+    statement = (
+        select(
+            *[
+                getattr(EventRegistration, name)
+                for name in EventRegistrationResponse.model_fields
+            ]
+        )
+        .where(EventRegistration.event_id == event_id)
+        .order_by(EventRegistration.registration_date, EventRegistration.id)
+    )
+    if status:
+        statement = statement.where(EventRegistration.status == status)
+
+    return export_response(
+        statement,
+        export_format,
+        f"registrations-{event_id}",
+        read_session_factory(request),
+    )
+
+
 # Payment endpoints
-@app.get("/payments")
-async def get_payments(
+@router.get("/payments", response_model=PaymentListResponse)
+def get_payments(
     skip: int = 0,
     limit: int = 100,
     payment_type: Optional[str] = None,
     status: Optional[str] = None,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
 ):
+    field_names = parse_fields(fields, PaymentResponse)
+    sort_keys = [Payment.payment_date, Payment.id]
     if current_user.role != UserRole.ADMIN:
         query = db.query(Payment).filter(Payment.user_id == current_user.id)
     else:
@@ -833,60 +2753,135 @@ async def get_payments(
     if status:
         query = query.filter(Payment.status == status)
 
-    payments = query.offset(skip).limit(limit).all()
-    return payments
+    if field_names is not None:
+        query = load_fields(query, Payment, field_names, sort_keys)
+    payments, next_cursor = paginate(query, sort_keys, skip, limit, cursor)
+    if field_names is not None:
+        return sparse_response(payments, field_names, cursor, next_cursor)
+    return page_response(payments, cursor, next_cursor)
 
 
-@app.post("/payments")
-async def create_payment(
+@router.get("/payments/export")
+def export_payments(
+    request: Request,
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format"),
+    payment_type: Optional[str] = None,
+    status: Optional[str] = None,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    statement = select(
+        *[getattr(Payment, name) for name in PaymentResponse.model_fields]
+    ).order_by(Payment.payment_date, Payment.id)
+    if current_user.role != UserRole.ADMIN:
+        statement = statement.where(Payment.user_id == current_user.id)
+    if payment_type:
+        statement = statement.where(Payment.payment_type == payment_type)
+    if status:
+        statement = statement.where(Payment.status == status)
+
+    return export_response(
+        statement, export_format, "payments", read_session_factory(request)
+    )
+
+
+@router.post("/payments", response_model=PaymentResponse)
+def create_payment(
     payment_data: PaymentCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     new_payment = Payment(**payment_data.dict())
     db.add(new_payment)
+    # Foreign keys are enforced on SQLite as well as PostgreSQL
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Unknown user or event")
+    apply_payment_rollup(db, new_payment, None, new_payment.status)
     db.commit()
+    dashboard_cache.clear()
     db.refresh(new_payment)
     return new_payment
 
 
-@app.put("/payments/{payment_id}/status")
-async def update_payment_status(
+@router.put("/payments/{payment_id}/status")
+def update_payment_status(
     payment_id: str,
     status: PaymentStatus,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Admin access required")
 
-    payment = db.query(Payment).filter(Payment.id == payment_id).first()
-    if not payment:
-        raise HTTPException(status_code=404, detail="Payment not found")
-
-    payment.status = status
-    db.commit()
-
-    return {"message": "Payment status updated successfully"}
+    # Compare-and-set on the old status: concurrent changes all read the same
+    # status, and only the one whose UPDATE matches may move the payment
+    # between rollup buckets. Losers re-read and usually find nothing to do.
+    for _ in range(5):
+        payment = db.get(Payment, payment_id, populate_existing=True)
+        if not payment:
+            raise HTTPException(status_code=404, detail="Payment not found")
+        old_status = payment.status
+        if old_status == status:
+            return {"message": "Payment status updated successfully"}
+
+        matches_old = (
+            Payment.status.is_(None)
+            if old_status is None
+            else Payment.status == old_status
+        )
+        result = db.execute(
+            update(Payment)
+            .where(Payment.id == payment_id, matches_old)
+            .values(status=status)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 1:
+            apply_payment_rollup(db, payment, old_status, status)
+            db.commit()
+            dashboard_cache.clear()
+            return {"message": "Payment status updated successfully"}
+        db.rollback()
+
+    raise HTTPException(
+        status_code=409, detail="Payment status is changing concurrently, retry"
+    )
 
 
 # Sponsor endpoints
-@app.get("/sponsors")
-async def get_sponsors(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    sponsors = (
-        db.query(Sponsor)
-        .filter(Sponsor.is_active == True)
-        .offset(skip)
-        .limit(limit)
-        .all()
+@router.get("/sponsors", response_model=SponsorListResponse)
+def get_sponsors(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+):
+    field_names = parse_fields(fields, SponsorResponse)
+    sort_keys = [Sponsor.created_at, Sponsor.id]
+    query = db.query(Sponsor).filter(Sponsor.is_active == True)
+
+    not_modified = conditional_get(
+        request, response, *list_etag(request, query, Sponsor.updated_at)
     )
-    return sponsors
+    if not_modified:
+        return not_modified
+
+    if field_names is not None:
+        query = load_fields(query, Sponsor, field_names, sort_keys)
+    sponsors, next_cursor = paginate(query, sort_keys, skip, limit, cursor)
+    if field_names is not None:
+        return sparse_response(sponsors, field_names, cursor, next_cursor, response)
+    return page_response(sponsors, cursor, next_cursor)
 
 
-@app.post("/sponsors")
-async def create_sponsor(
+@router.post("/sponsors", response_model=SponsorResponse)
+def create_sponsor(
     sponsor_data: SponsorCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     if current_user.role != UserRole.ADMIN:
@@ -899,19 +2894,19 @@ async def create_sponsor(
     return new_sponsor
 
 
-@app.get("/sponsors/{sponsor_id}")
-async def get_sponsor(sponsor_id: str, db: Session = Depends(get_db)):
+@router.get("/sponsors/{sponsor_id}", response_model=SponsorResponse)
+def get_sponsor(sponsor_id: str, db: Session = Depends(get_read_db)):
     sponsor = db.query(Sponsor).filter(Sponsor.id == sponsor_id).first()
     if not sponsor:
         raise HTTPException(status_code=404, detail="Sponsor not found")
     return sponsor
 
 
-@app.put("/sponsors/{sponsor_id}")
-async def update_sponsor(
+@router.put("/sponsors/{sponsor_id}", response_model=SponsorResponse)
+def update_sponsor(
     sponsor_id: str,
     sponsor_data: dict,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     if current_user.role != UserRole.ADMIN:
@@ -931,111 +2926,690 @@ async def update_sponsor(
 
 
 # Gallery endpoints
-@app.get("/gallery")
-async def get_gallery(
+@router.get("/gallery", response_model=GalleryListResponse)
+def get_gallery(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     media_type: Optional[str] = None,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_read_db),
 ):
+    field_names = parse_fields(fields, GalleryResponse)
+    sort_keys = [Gallery.uploaded_at, Gallery.id]
     query = db.query(Gallery)
 
     if media_type:
         query = query.filter(Gallery.media_type == media_type)
 
-    gallery_items = query.offset(skip).limit(limit).all()
-    return gallery_items
+    not_modified = conditional_get(
+        request,
+        response,
+        # Renditions land after upload without touching uploaded_at.
+        *list_etag(
+            request, query, Gallery.uploaded_at, func.count(Gallery.medium_filename)
+        ),
+    )
+    if not_modified:
+        return not_modified
+
+    if field_names is not None:
+        query = load_fields(query, Gallery, field_names, sort_keys)
+    gallery_items, next_cursor = paginate(query, sort_keys, skip, limit, cursor)
+    if field_names is not None:
+        return sparse_response(
+            gallery_items, field_names, cursor, next_cursor, response
+        )
+    return page_response(gallery_items, cursor, next_cursor)
+
+
+def acquire_blob(db: Session, stored: StoredMedia) -> "MediaBlob":
+    """Take a reference on the blob holding ``stored``, creating it if new.
+
+    An upsert, so concurrent uploads of the same bytes cannot race to insert
+    it; runs in the caller's transaction.
+    """
+    dialect = postgresql if db.bind.dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(MediaBlob).values(
+        content_hash=stored.content_hash,
+        filename=stored.filename,
+        media_type=stored.media_type,
+        file_size=stored.file_size,
+        ref_count=1,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[MediaBlob.content_hash],
+        set_={"ref_count": MediaBlob.ref_count + 1},
+    )
+    db.execute(stmt)
+    return db.get(MediaBlob, stored.content_hash, populate_existing=True)
+
+
+def release_blob(db: Session, content_hash: str) -> Optional[List[Optional[str]]]:
+    """Drop a reference on a blob, in the caller's transaction.
+
+    Returns the files to delete: the blob's files when this was the last
+    reference, otherwise none. ``None`` means there is no blob for
+    ``content_hash``.
+    """
+    db.query(MediaBlob).filter(MediaBlob.content_hash == content_hash).update(
+        {MediaBlob.ref_count: MediaBlob.ref_count - 1}, synchronize_session=False
+    )
+    blob = db.get(MediaBlob, content_hash, populate_existing=True)
+    if blob is None:
+        return None
+    if blob.ref_count > 0:
+        return []
+    db.delete(blob)
+    return [blob.filename, blob.thumbnail_filename, blob.medium_filename]
+
+
+def save_media_row(db: Session, row, stored: StoredMedia) -> tuple:
+    """Insert ``row`` for ``stored``, taking a reference on its blob.
+
+    Returns the row id and whether the blob is new, i.e. whether ``stored``
+    became its file.
+    """
+    blob = acquire_blob(db, stored)
+    new_blob = blob.ref_count == 1
+    row.filename = blob.filename
+    row.media_type = blob.media_type
+    row.content_hash = blob.content_hash
+    row.file_size = blob.file_size
+    row.thumbnail_filename = blob.thumbnail_filename
+    row.medium_filename = blob.medium_filename
+    db.add(row)
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Unknown event")
+
+    # The upsert keeps the blob row (on SQLite, the database) write-locked
+    # until the commit, so this cannot interleave with delete_media_row
+    # unlinking the same content.
+    if new_blob:
+        place_file(stored)
+    else:
+        discard_file(stored)
+    db.commit()
+    return row.id, new_blob
+
+
+async def store_media(
+    db: Session, upload: UploadFile, row, background_tasks: BackgroundTasks
+) -> str:
+    """Save ``upload`` as the file of ``row`` and insert ``row``.
+
+    Content that is already stored is not written again; the row shares the
+    existing file and renditions.
+    """
+    stored = await save_upload(upload)
+    try:
+        return await add_media_row(db, stored, row, background_tasks)
+    except BaseException:
+        await run_in_threadpool(discard_file, stored)
+        raise
+
+
+async def add_media_row(
+    db: Session, stored: StoredMedia, row, background_tasks: BackgroundTasks
+) -> str:
+    """Insert ``row`` for the file ``save_upload`` or ``hash_part_file``
+    described. If the insert fails the file is left for the caller."""
+    row_id, new_blob = await run_in_threadpool(save_media_row, db, row, stored)
+
+    # Duplicates pick up the renditions of the first upload, or get them from
+    # record_derivatives when that is still rendering.
+    if new_blob and stored.media_type == "photo":
+        background_tasks.add_task(
+            render_media_derivatives, stored.content_hash, stored.filename
+        )
+    return row_id
+
+
+def record_derivatives(content_hash: str, derived: Dict[str, str]) -> None:
+    values = {
+        "thumbnail_filename": derived["thumbnail"],
+        "medium_filename": derived["medium"],
+    }
+    db = SessionLocal()
+    try:
+        blobs = db.query(MediaBlob).filter(MediaBlob.content_hash == content_hash)
+        if not blobs.update(values, synchronize_session=False):
+            # The last row was deleted while rendering, and delete_media_row
+            # only knew the blob's own file; nothing refers to these.
+            remove_media(derived["thumbnail"], derived["medium"])
+            return
+        # Every row sharing the blob gets the renditions.
+        for model in (Gallery, EventMedia):
+            db.query(model).filter(model.content_hash == content_hash).update(
+                values, synchronize_session=False
+            )
+        db.commit()
+    finally:
+        db.close()
+
+
+async def render_media_derivatives(content_hash: str, filename: str) -> None:
+    """Background task: render a photo's renditions and record them."""
+    try:
+        derived = await generate_derivatives(filename)
+    except Exception:
+        logger.exception("Could not render renditions of %s", filename)
+        return
+    await run_in_threadpool(record_derivatives, content_hash, derived)
+
+
+def delete_media_row(db: Session, row) -> None:
+    """Delete ``row`` and, with the last reference to them, its files."""
+    filenames = None
+    if row.content_hash is not None:
+        filenames = release_blob(db, row.content_hash)
+    if filenames is None:
+        # Stored before content addressing; the files are the row's own.
+        filenames = [row.filename, row.thumbnail_filename, row.medium_filename]
+    db.delete(row)
+    db.flush()
+    # Unlinked before the commit, while the blob row is still write-locked:
+    # an upload of the same content waits in acquire_blob, then finds no blob
+    # and places its own copy.
+    remove_media(*filenames)
+    db.commit()
 
 
-@app.post("/gallery/upload")
+# Async so the file can be streamed to disk with aiofiles; the database work
+# is handed to the thread pool.
+@router.post("/gallery/upload")
 async def upload_to_gallery(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     title: str = Form(...),
     caption: Optional[str] = Form(None),
     event_id: Optional[str] = Form(None),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    # Save file logic would go here
-    # For now, just create database entry
-
-    media_type = "photo" if file.content_type.startswith("image/") else "video"
-
     new_gallery_item = Gallery(
         title=title,
-        filename=file.filename,
-        media_type=media_type,
         caption=caption,
-        event_id=event_id,
+        event_id=event_id or None,
         uploaded_by=current_user.id,
     )
+    gallery_id = await store_media(db, file, new_gallery_item, background_tasks)
+    return {"message": "File uploaded successfully", "id": gallery_id}
+
+
+@router.delete("/gallery/{gallery_id}")
+async def delete_gallery_item(
+    gallery_id: str,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    item = await run_in_threadpool(db.get, Gallery, gallery_id)
+    if not item:
+        raise HTTPException(status_code=404, detail="Gallery item not found")
+    if current_user.id != item.uploaded_by and current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Permission denied")
+
+    await run_in_threadpool(delete_media_row, db, item)
+    return {"message": "Gallery item deleted successfully"}
+
+
+# Event media endpoints
+@router.get("/events/{event_id}/media", response_model=List[EventMediaResponse])
+def get_event_media(
+    event_id: str,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_read_db),
+):
+    if db.get(Event, event_id) is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return (
+        db.query(EventMedia)
+        .filter(EventMedia.event_id == event_id)
+        .order_by(EventMedia.uploaded_at, EventMedia.id)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+
+
+@router.post("/events/{event_id}/media")
+async def upload_event_media(
+    event_id: str,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    caption: Optional[str] = Form(None),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    if await run_in_threadpool(db.get, Event, event_id) is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+
+    media = EventMedia(event_id=event_id, caption=caption, uploaded_by=current_user.id)
+    media_id = await store_media(db, file, media, background_tasks)
+    return {"message": "File uploaded successfully", "id": media_id}
+
+
+@router.delete("/events/{event_id}/media/{media_id}")
+async def delete_event_media(
+    event_id: str,
+    media_id: str,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    media = await run_in_threadpool(db.get, EventMedia, media_id)
+    if not media or media.event_id != event_id:
+        raise HTTPException(status_code=404, detail="Event media not found")
+    if current_user.id != media.uploaded_by and current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Permission denied")
+
+    await run_in_threadpool(delete_media_row, db, media)
+    return {"message": "Event media deleted successfully"}
+
+
+# Resumable upload endpoints
+def purge_expired_uploads(db: Session) -> List[str]:
+    """Delete expired upload sessions; returns their ids so the caller can
+    remove the part files."""
+    expired = [
+        session_id
+        for (session_id,) in db.query(UploadSession.id).filter(
+            UploadSession.expires_at < datetime.utcnow()
+        )
+    ]
+    if expired:
+        db.query(UploadSession).filter(UploadSession.id.in_(expired)).delete(
+            synchronize_session=False
+        )
+    return expired
 
-    db.add(new_gallery_item)
+
+def open_upload_session(db: Session, session: UploadSession) -> List[str]:
+    if session.event_id and db.get(Event, session.event_id) is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    expired = purge_expired_uploads(db)
+    db.add(session)
     db.commit()
-    db.refresh(new_gallery_item)
+    db.refresh(session)
+    return expired
 
-    return {"message": "File uploaded successfully", "id": new_gallery_item.id}
 
+def get_upload_session(db: Session, session_id: str, user_id: str) -> UploadSession:
+    session = db.get(UploadSession, session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    if session.created_by != user_id:
+        raise HTTPException(status_code=403, detail="Permission denied")
+    if session.expires_at < datetime.utcnow():
+        raise HTTPException(status_code=410, detail="Upload session expired")
+    return session
 
-# Statistics endpoints
-@app.get("/stats/dashboard")
-async def get_dashboard_stats(
-    current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
+
+def record_upload_offset(db: Session, session: UploadSession, received: int) -> None:
+    session.received = received
+    db.commit()
+    db.refresh(session)
+
+
+def delete_upload_session(db: Session, session: UploadSession) -> None:
+    db.delete(session)
+    db.commit()
+
+
+@router.post("/uploads", response_model=UploadSessionResponse, status_code=201)
+async def create_upload_session(
+    payload: UploadSessionCreate,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
 ):
-    if current_user.role != UserRole.ADMIN:
-        raise HTTPException(status_code=403, detail="Admin access required")
+    """Start a resumable upload.
+
+    Send the file with ``PUT /uploads/{id}?offset=N`` in pieces of about
+    ``chunk_size`` bytes, then ``POST /uploads/{id}/complete``. After a
+    dropped connection, ``GET /uploads/{id}`` gives the offset to resume from.
+    """
+    media_type = media_type_for(payload.filename)
+    limit = size_limit_for(media_type)
+    if payload.size <= 0:
+        raise HTTPException(status_code=400, detail="File is empty")
+    if payload.size > limit:
+        raise HTTPException(
+            status_code=413, detail=f"File exceeds the {limit} byte limit"
+        )
+    if payload.target == UploadTarget.GALLERY and not payload.title:
+        raise HTTPException(status_code=400, detail="Gallery uploads need a title")
+    if payload.target == UploadTarget.EVENT_MEDIA and not payload.event_id:
+        raise HTTPException(status_code=400, detail="Event media needs an event_id")
+
+    session = UploadSession(
+        target=payload.target.value,
+        filename=payload.filename,
+        media_type=media_type,
+        total_size=payload.size,
+        checksum=payload.checksum,
+        title=payload.title,
+        caption=payload.caption,
+        event_id=payload.event_id or None,
+        created_by=current_user.id,
+        expires_at=datetime.utcnow()
+        + timedelta(hours=settings.UPLOAD_SESSION_TTL_HOURS),
+    )
+    expired = await run_in_threadpool(open_upload_session, db, session)
+    await delete_media(*map(session_part_name, expired))
+    await create_part_file(session.id)
+    return session
+
 
-    total_members = db.query(User).count()
-    active_members = (
-        db.query(User).filter(User.membership_status == MembershipStatus.ACTIVE).count()
+@router.get("/uploads/{session_id}", response_model=UploadSessionResponse)
+def get_upload_status(
+    session_id: str,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    return get_upload_session(db, session_id, current_user.id)
+
+
+@router.put("/uploads/{session_id}", response_model=UploadSessionResponse)
+async def upload_chunk(
+    session_id: str,
+    offset: int,
+    request: Request,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Write the request body at ``offset``, which must be the session's
+    ``received``."""
+    async with locked_part_file(session_id) as part:
+        # Loaded under the lock, so a retry cannot act on a stale offset
+        session = await run_in_threadpool(
+            get_upload_session, db, session_id, current_user.id
+        )
+        if offset != session.received:
+            raise HTTPException(
+                status_code=409, detail=f"Expected offset {session.received}"
+            )
+        received = await write_chunk(part, offset, request.stream(), session.total_size)
+        await run_in_threadpool(record_upload_offset, db, session, received)
+    return session
+
+
+@router.post("/uploads/{session_id}/complete")
+async def complete_upload(
+    session_id: str,
+    background_tasks: BackgroundTasks,
+    payload: Optional[UploadSessionComplete] = None,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Verify the checksum and file the upload as a gallery item or event
+    media."""
+    async with locked_part_file(session_id):
+        session = await run_in_threadpool(
+            get_upload_session, db, session_id, current_user.id
+        )
+        if session.received != session.total_size:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Upload incomplete: {session.received} of "
+                f"{session.total_size} bytes received",
+            )
+        checksum = (payload.checksum if payload else None) or session.checksum
+        if not checksum:
+            raise HTTPException(status_code=400, detail="A checksum is required")
+
+        try:
+            stored = await hash_part_file(session_id, session.filename, checksum)
+        except HTTPException:
+            # Corrupt data: the client starts again from offset 0.
+            await run_in_threadpool(record_upload_offset, db, session, 0)
+            raise
+
+        if session.target == UploadTarget.GALLERY:
+            row = Gallery(
+                title=session.title,
+                caption=session.caption,
+                event_id=session.event_id,
+                uploaded_by=current_user.id,
+            )
+        else:
+            row = EventMedia(
+                event_id=session.event_id,
+                caption=session.caption,
+                uploaded_by=current_user.id,
+            )
+        # Deleted in the same commit as the media row is inserted. The lock is
+        # held until then, so a retried complete finds either the part file
+        # and the session, or neither.
+        db.delete(session)
+        try:
+            row_id = await add_media_row(db, stored, row, background_tasks)
+        except HTTPException:
+            # The event was deleted during the upload, so it can never be
+            # filed. Other failures keep the session and part file for a retry.
+            await run_in_threadpool(delete_upload_session, db, session)
+            await run_in_threadpool(discard_file, stored)
+            raise
+    return {"message": "File uploaded successfully", "id": row_id}
+
+
+@router.delete("/uploads/{session_id}")
+async def cancel_upload(
+    session_id: str,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    session = await run_in_threadpool(
+        get_upload_session, db, session_id, current_user.id
     )
-    pending_approvals = (
-        db.query(User)
+    await run_in_threadpool(delete_upload_session, db, session)
+    await delete_media(session_part_name(session_id))
+    return {"message": "Upload cancelled"}
+
+
+# Media endpoints
+@router.api_route("/media/{filename:path}", methods=["GET", "HEAD"])
+async def serve_media(filename: str, request: Request):
+    return await media_response(request, filename)
+
+
+# Search endpoints
+@router.get("/search", response_model=List[SearchResult])
+def search(
+    q: str,
+    types: Optional[str] = None,
+    limit: int = settings.DEFAULT_PAGE_SIZE,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+):
+    requested = SEARCH_TYPES
+    if types:
+        requested = {name.strip() for name in types.split(",")} - {""}
+        unknown = requested - SEARCH_TYPES
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown search types: {', '.join(sorted(unknown))}",
+            )
+
+    # Member records are only searchable by admins
+    if current_user.role != UserRole.ADMIN:
+        if types and "user" in requested:
+            raise HTTPException(status_code=403, detail="Admin access required")
+        requested = requested - {"user"}
+
+    terms = re.findall(r"\w+", q.lower())
+    if not terms or not requested:
+        return []
+
+    limit = max(1, min(limit, settings.MAX_PAGE_SIZE))
+    rows = search_documents(db, terms, sorted(requested), limit)
+    return [
+        SearchResult(
+            type=row.entity_type, id=row.entity_id, title=row.title, score=row.score
+        )
+        for row in rows
+    ]
+
+
+# Statistics endpoints
+def compute_dashboard_stats(db: Session) -> Dict[str, Any]:
+    """Compute every dashboard figure in a single round trip."""
+    users = select(
+        func.count(User.id).label("total_members"),
+        func.count(User.id)
+        .filter(User.membership_status == MembershipStatus.ACTIVE)
+        .label("active_members"),
+        func.count(User.id)
         .filter(User.membership_status == MembershipStatus.PENDING)
-        .count()
-    )
-    total_events = db.query(Event).count()
-    total_clubs = db.query(Club).filter(Club.is_active == True).count()
-    total_revenue = (
-        db.query(Payment).filter(Payment.status == PaymentStatus.COMPLETED).count()
+        .label("pending_approvals"),
+    ).subquery()
+    events = select(func.count(Event.id).label("total_events")).subquery()
+    clubs = (
+        select(func.count(Club.id).label("total_clubs"))
+        .where(Club.is_active == True)
+        .subquery()
     )
+    payments = select(
+        func.coalesce(
+            func.sum(Payment.amount).filter(Payment.status == PaymentStatus.COMPLETED),
+            0.0,
+        ).label("total_revenue")
+    ).subquery()
+
+    row = db.execute(
+        select(users, events, clubs, payments).select_from(
+            users.join(events, true()).join(clubs, true()).join(payments, true())
+        )
+    ).one()
+    return dict(row._mapping)
 
-    return {
-        "total_members": total_members,
-        "active_members": active_members,
-        "pending_approvals": pending_approvals,
-        "total_events": total_events,
-        "total_clubs": total_clubs,
-        "total_revenue": total_revenue,
-        "system_uptime": "99.8%",
-    }
+
+@router.get("/stats/dashboard")
+def get_dashboard_stats(
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    # The primary, not the replica: a lagging replica would put pre-write
+    # figures back into the cache right after a write cleared it.
+    db: Session = Depends(get_db),
+):
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    stats = dashboard_cache.get("dashboard")
+    if stats is None:
+        stats = compute_dashboard_stats(db)
+        dashboard_cache.set("dashboard", stats)
+
+    return {**stats, "system_uptime": "99.8%"}
 
 
-@app.get("/stats/financial")
-async def get_financial_stats(
-    current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
+@router.get("/stats/financial")
+def get_financial_stats(
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    group_by: str = "month",
+    payment_type: Optional[str] = None,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
 ):
+    """Revenue figures read from the payment_monthly_rollups table.
+
+    ``start``/``end`` are inclusive YYYY-MM months and default to the last six
+    months. ``revenue`` is everything collected, ``refunds`` what was paid
+    back, and ``net`` the difference; ``expenses`` mirrors ``refunds`` since
+    refunds are the only outgoing money the API records.
+    """
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Admin access required")
+    if group_by not in ("month", "payment_type"):
+        raise HTTPException(
+            status_code=400, detail="group_by must be 'month' or 'payment_type'"
+        )
 
-    # Get monthly financial data
-    # This is simplified - in production you'd calculate actual monthly totals
-    monthly_data = [
-        {"month": "Jan", "revenue": 15200, "expenses": 2000, "net": 13200},
-        {"month": "Feb", "revenue": 16800, "expenses": 1500, "net": 15300},
-        {"month": "Mar", "revenue": 18200, "expenses": 3000, "net": 15200},
-        {"month": "Apr", "revenue": 19500, "expenses": 2500, "net": 17000},
-        {"month": "May", "revenue": 17800, "expenses": 1800, "net": 16000},
-        {"month": "Jun", "revenue": 21400, "expenses": 3200, "net": 18200},
-    ]
+    end = parse_month(end) if end else datetime.utcnow().strftime("%Y-%m")
+    start = parse_month(start) if start else shift_month(end, -5)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+
+    group_column = getattr(PaymentMonthlyRollup, group_by)
+    query = (
+        db.query(
+            group_column.label("key"),
+            func.sum(PaymentMonthlyRollup.completed_amount).label("completed"),
+            func.sum(PaymentMonthlyRollup.refunded_amount).label("refunded"),
+            func.sum(
+                PaymentMonthlyRollup.completed_count
+                + PaymentMonthlyRollup.refunded_count
+            ).label("payments"),
+        )
+        .filter(PaymentMonthlyRollup.month >= start, PaymentMonthlyRollup.month <= end)
+        .group_by(group_column)
+        .order_by(group_column)
+    )
+    if payment_type:
+        query = query.filter(PaymentMonthlyRollup.payment_type == payment_type)
+
+    def figures(completed: float, refunded: float, payments: int) -> Dict[str, Any]:
+        return {
+            "revenue": completed + refunded,
+            "refunds": refunded,
+            "expenses": refunded,
+            "net": completed,
+            "payments": payments,
+        }
+
+    rows = {
+        row.key: figures(row.completed or 0.0, row.refunded or 0.0, row.payments or 0)
+        for row in query
+    }
+    totals = figures(
+        sum(row["net"] for row in rows.values()),
+        sum(row["refunds"] for row in rows.values()),
+        sum(row["payments"] for row in rows.values()),
+    )
 
-    return {"monthly_data": monthly_data}
+    if group_by == "payment_type":
+        return {
+            "start": start,
+            "end": end,
+            "payment_type_data": [
+                {"payment_type": key, **values} for key, values in rows.items()
+            ],
+            "totals": totals,
+        }
+
+    # Months without payments are reported as zeros so charts have no gaps.
+    monthly_data = []
+    month = start
+    while month <= end:
+        monthly_data.append({"month": month, **rows.get(month, figures(0.0, 0.0, 0))})
+        month = shift_month(month, 1)
+
+    return {"start": start, "end": end, "monthly_data": monthly_data, "totals": totals}
+
+
+@router.get("/stats/runtime")
+def get_runtime_stats(current_user: AuthenticatedUser = Depends(get_current_user)):
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    return {
+        "password_hashing": password_hasher.stats(),
+        "auth_cache": principal_cache.stats(),
+        "dashboard_cache": dashboard_cache.stats(),
+        "compression_cache": compression_cache.stats(),
+    }
 
 
 # System settings endpoints
-@app.get("/settings")
-async def get_system_settings(
-    current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
+@router.get("/settings", response_model=SystemSettingsResponse)
+def get_system_settings(
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
 ):
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Admin access required")
@@ -1051,10 +3625,10 @@ async def get_system_settings(
     return settings
 
 
-@app.put("/settings")
-async def update_system_settings(
+@router.put("/settings", response_model=SystemSettingsResponse)
+def update_system_settings(
     settings_data: dict,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     if current_user.role != UserRole.ADMIN:
@@ -1076,7 +3650,101 @@ async def update_system_settings(
     return settings
 
 
+# Application factory
+def check_schema_revision(engine) -> None:
+    """Warn when the database is not at the latest Alembic revision.
+
+    Schema changes are applied by migrations (see init_db.py), never at
+    startup, so several workers can boot against one database without racing
+    on DDL.
+    """
+    from alembic.config import Config
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    config = Config(
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini")
+    )
+    head = ScriptDirectory.from_config(config).get_current_head()
+    with engine.connect() as connection:
+        current = MigrationContext.configure(connection).get_current_revision()
+    if current != head:
+        logger.warning(
+            "Database schema is at revision %s but the code expects %s; "
+            "run `python init_db.py` or `alembic upgrade head`.",
+            current,
+            head,
+        )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Endpoints that touch the database are plain ``def`` functions: FastAPI
+    # runs them in anyio's worker thread pool so blocking Session calls never
+    # stall the event loop. The pool is bounded by DB_THREADPOOL_SIZE.
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = settings.DB_THREADPOOL_SIZE
+
+    engine = create_db_engine(settings.DATABASE_URL)
+    read_engine = engine
+    if settings.DATABASE_READ_URL:
+        read_engine = create_db_engine(settings.DATABASE_READ_URL)
+    SessionLocal.configure(bind=engine)
+    ReadSessionLocal.configure(bind=read_engine)
+    app.state.engine = engine
+    app.state.read_engine = read_engine
+
+    if settings.SCHEMA_CHECK_ON_STARTUP:
+        await anyio.to_thread.run_sync(check_schema_revision, engine)
+
+    try:
+        yield
+    finally:
+        password_hasher.shutdown()
+        shutdown_derivatives()
+        if read_engine is not engine:
+            read_engine.dispose()
+        engine.dispose()
+
+
+def create_app() -> FastAPI:
+    """Build the API application from ``config.settings``.
+
+    No database work happens here; engines are created when the server
+    starts and disposed when it stops (see ``lifespan``).
+    """
+    application = FastAPI(
+        title=settings.APP_NAME,
+        description=settings.APP_DESCRIPTION,
+        version=settings.APP_VERSION,
+        # Responses are validated by typed response models and encoded by orjson
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan,
+    )
+    application.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.ALLOWED_ORIGINS,
+        allow_credentials=True,
+        allow_methods=settings.ALLOWED_METHODS,
+        allow_headers=settings.ALLOWED_HEADERS,
+    )
+    application.add_middleware(
+        WriteMarkerMiddleware, max_age=settings.READ_YOUR_WRITES_SECONDS
+    )
+    application.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+    application.include_router(router)
+    return application
+
+
+app = create_app()
+
+
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(app, host=settings.API_HOST, port=settings.API_PORT)
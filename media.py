@@ -0,0 +1,436 @@
+"""
+Media storage for DSRFA Backend API
+Streams uploaded gallery and event files to UPLOAD_DIRECTORY, where they are
+stored once per content hash as ab/cd/<sha256><ext>
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import AsyncIterator, Dict, Optional, Tuple
+import asyncio
+import contextlib
+import fcntl
+import hashlib
+import mimetypes
+import multiprocessing
+import os
+import re
+import stat
+import threading
+import uuid
+
+import aiofiles
+import aiofiles.os
+import anyio
+from fastapi import HTTPException, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
+from PIL import Image, ImageOps
+from pydantic import BaseModel
+
+from config import settings
+
+
+class StoredMedia(BaseModel):
+    filename: str  # path relative to UPLOAD_DIRECTORY
+    media_type: str  # photo, video
+    content_hash: str  # hex SHA-256 of the file
+    file_size: int
+    temp_path: str  # the complete copy, until place_file or discard_file
+
+
+def media_type_for(filename: Optional[str]) -> str:
+    extension = os.path.splitext(filename or "")[1].lower()
+    if extension in settings.ALLOWED_IMAGE_EXTENSIONS:
+        return "photo"
+    if extension in settings.ALLOWED_VIDEO_EXTENSIONS:
+        return "video"
+    raise HTTPException(status_code=400, detail="File type not allowed")
+
+
+def size_limit_for(media_type: str) -> int:
+    if media_type == "video":
+        return settings.MAX_VIDEO_FILE_SIZE
+    return settings.MAX_FILE_SIZE
+
+
+def media_path(filename: str) -> str:
+    return os.path.join(settings.UPLOAD_DIRECTORY, filename)
+
+
+def blob_filename(content_hash: str, extension: str) -> str:
+    # Two levels of 256 shards keep directories small enough to list.
+    return f"{content_hash[:2]}/{content_hash[2:4]}/{content_hash}{extension}"
+
+
+async def save_upload(upload: UploadFile) -> StoredMedia:
+    """Copy ``upload`` into UPLOAD_DIRECTORY in UPLOAD_CHUNK_SIZE chunks.
+
+    The content is hashed and size-checked as it is written, so at most one
+    chunk is held in memory. The data stays in a temporary file; whether it is
+    placed under its content-addressed name or discarded as a duplicate is
+    decided with the blob row locked (see place_file). A rejected or
+    interrupted upload leaves nothing behind.
+    """
+    media_type = media_type_for(upload.filename)
+    limit = size_limit_for(media_type)
+    extension = os.path.splitext(upload.filename)[1].lower()
+
+    temp_directory = media_path("tmp")
+    await aiofiles.os.makedirs(temp_directory, exist_ok=True)
+    temp_path = os.path.join(temp_directory, f"{uuid.uuid4().hex}.part")
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(temp_path, "wb") as out:
+            while chunk := await upload.read(settings.UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > limit:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File exceeds the {limit} byte limit",
+                    )
+                digest.update(chunk)
+                await out.write(chunk)
+            if size == 0:
+                raise HTTPException(status_code=400, detail="File is empty")
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            await aiofiles.os.remove(temp_path)
+        raise
+
+    content_hash = digest.hexdigest()
+    return StoredMedia(
+        filename=blob_filename(content_hash, extension),
+        media_type=media_type,
+        content_hash=content_hash,
+        file_size=size,
+        temp_path=temp_path,
+    )
+
+
+def place_file(stored: StoredMedia) -> None:
+    """Move ``stored``'s temporary copy to its content-addressed name.
+
+    Called in a worker thread with the blob row locked. The copy is fsynced
+    only here, so duplicates that are discarded never pay for it.
+    """
+    descriptor = os.open(stored.temp_path, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+    os.makedirs(os.path.dirname(media_path(stored.filename)), exist_ok=True)
+    os.replace(stored.temp_path, media_path(stored.filename))
+
+
+def discard_file(stored: StoredMedia) -> None:
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(stored.temp_path)
+
+
+def session_part_name(session_id: str) -> str:
+    # Under tmp/, which /media never serves
+    return f"tmp/sessions/{session_id}.part"
+
+
+async def create_part_file(session_id: str) -> None:
+    path = media_path(session_part_name(session_id))
+    await aiofiles.os.makedirs(os.path.dirname(path), exist_ok=True)
+    async with aiofiles.open(path, "wb"):
+        pass
+
+
+@contextlib.asynccontextmanager
+async def locked_part_file(session_id: str):
+    """Open a resumable upload's part file for writing, exclusively.
+
+    A second writer (a retry racing the original request, possibly in another
+    worker) gets a 409 instead of interleaving its bytes.
+    """
+    try:
+        part = await aiofiles.open(media_path(session_part_name(session_id)), "r+b")
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    try:
+        try:
+            fcntl.flock(part.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise HTTPException(
+                status_code=409, detail="Another request is writing this upload"
+            )
+        yield part
+    finally:
+        # Closing the file releases the lock
+        await part.close()
+
+
+async def write_chunk(
+    part, offset: int, chunks: AsyncIterator[bytes], limit: int
+) -> int:
+    """Write ``chunks`` to ``part`` from ``offset`` and return the new offset.
+
+    Anything past ``offset`` is left over from an interrupted request and is
+    discarded first. The data is fsynced before returning, so the offset can
+    be recorded as durable.
+    """
+    await part.truncate(offset)
+    await part.seek(offset)
+    written = offset
+    async for chunk in chunks:
+        written += len(chunk)
+        if written > limit:
+            raise HTTPException(
+                status_code=413, detail=f"Upload exceeds its declared {limit} bytes"
+            )
+        await part.write(chunk)
+    await part.flush()
+    await anyio.to_thread.run_sync(os.fsync, part.fileno())
+    return written
+
+
+def hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as source:
+        while chunk := source.read(settings.UPLOAD_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def hash_part_file(
+    session_id: str, filename: str, expected_hash: str
+) -> StoredMedia:
+    """Describe a completed resumable upload for place_file.
+
+    The part file is re-read to hash it. A mismatch with ``expected_hash``
+    raises 400 and leaves the file to be overwritten from offset 0.
+    """
+    path = media_path(session_part_name(session_id))
+    content_hash = await anyio.to_thread.run_sync(hash_file, path)
+    if content_hash != expected_hash.lower():
+        raise HTTPException(status_code=400, detail="Checksum mismatch")
+
+    extension = os.path.splitext(filename)[1].lower()
+    return StoredMedia(
+        filename=blob_filename(content_hash, extension),
+        media_type=media_type_for(filename),
+        content_hash=content_hash,
+        file_size=(await aiofiles.os.stat(path)).st_size,
+        temp_path=path,
+    )
+
+
+def remove_media(*filenames: Optional[str]) -> None:
+    for filename in filenames:
+        if filename:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(media_path(filename))
+
+
+async def delete_media(*filenames: Optional[str]) -> None:
+    await anyio.to_thread.run_sync(remove_media, *filenames)
+
+
+def media_url(filename: Optional[str]) -> Optional[str]:
+    if not filename:
+        return None
+    return f"{settings.MEDIA_URL.rstrip('/')}/{filename}"
+
+
+# Rendition name -> longest edge in pixels
+RENDITIONS = {
+    "thumbnail": settings.THUMBNAIL_MAX_EDGE,
+    "medium": settings.MEDIUM_MAX_EDGE,
+}
+
+
+def render_derivatives(filename: str) -> Dict[str, str]:
+    """Write a WebP of ``filename`` for each rendition.
+
+    Runs in a worker process. Returns rendition name -> filename relative to
+    UPLOAD_DIRECTORY. Images are only ever scaled down.
+    """
+    stem = os.path.splitext(filename)[0]
+    derived: Dict[str, str] = {}
+    with Image.open(media_path(filename)) as original:
+        # JPEG can decode straight at a reduced scale, which is far cheaper
+        # than decoding full size and then resampling.
+        original.draft("RGB", (settings.MEDIUM_MAX_EDGE, settings.MEDIUM_MAX_EDGE))
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+        # Largest first, so each rendition is resampled from the previous one.
+        for name, edge in sorted(RENDITIONS.items(), key=lambda item: -item[1]):
+            image.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+            target = f"{stem}_{name}.webp"
+            temp_path = media_path(f"{target}.part")
+            image.save(temp_path, "WEBP", quality=settings.WEBP_QUALITY, method=4)
+            os.replace(temp_path, media_path(target))
+            derived[name] = target
+    return derived
+
+
+_derivative_executor: Optional[ProcessPoolExecutor] = None
+_derivative_lock = threading.Lock()
+
+
+def derivative_executor() -> ProcessPoolExecutor:
+    global _derivative_executor
+    with _derivative_lock:
+        if _derivative_executor is None:
+            # spawn rather than fork: the API process has an event loop and
+            # live threads that must not be copied into the workers.
+            _derivative_executor = ProcessPoolExecutor(
+                max_workers=settings.DERIVATIVE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _derivative_executor
+
+
+async def generate_derivatives(filename: str) -> Dict[str, str]:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        derivative_executor(), render_derivatives, filename
+    )
+
+
+def shutdown_derivatives() -> None:
+    global _derivative_executor
+    with _derivative_lock:
+        if _derivative_executor is not None:
+            _derivative_executor.shutdown(wait=False, cancel_futures=True)
+            _derivative_executor = None
+
+
+# <sha256>[_rendition] stems name content-addressed files
+CONTENT_ADDRESSED_STEM = re.compile(r"^[0-9a-f]{64}(_[a-z]+)?$")
+
+
+def served_media_path(filename: str) -> str:
+    """Map a /media path to a file in UPLOAD_DIRECTORY, or 404."""
+    normalized = os.path.normpath(filename)
+    if (
+        os.path.isabs(normalized)
+        or normalized.startswith("..")
+        or normalized.split(os.sep)[0] == "tmp"
+    ):
+        raise HTTPException(status_code=404, detail="File not found")
+    return media_path(normalized)
+
+
+def media_etag(filename: str, stat_result: os.stat_result) -> str:
+    stem = os.path.basename(filename).split(".")[0]
+    if CONTENT_ADDRESSED_STEM.match(stem):
+        return f'"{stem}"'
+    # Files stored before content addressing
+    return f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single ``bytes=`` range into inclusive (start, end) offsets.
+
+    Returns ``None`` for headers that should be ignored in favour of the whole
+    file: other units, multiple ranges and malformed values. Raises 416 when
+    the range lies outside the file.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, dash, last = spec.strip().partition("-")
+    if not dash or not (first.isdigit() or last.isdigit()):
+        return None
+    if first and last and not (first.isdigit() and last.isdigit()):
+        return None
+    if not first:
+        # Suffix range: the final ``last`` bytes
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if int(last or start) < start:
+            return None
+    if start >= size or size == 0:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
+
+
+async def iter_file(path: str, start: int, end: int) -> AsyncIterator[bytes]:
+    async with aiofiles.open(path, "rb") as source:
+        await source.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = await source.read(min(settings.MEDIA_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+async def media_response(request: Request, filename: str) -> Response:
+    """Serve a stored file with validators and single-range support.
+
+    Stored names never change content, so responses are cacheable forever.
+    With MEDIA_ACCEL_REDIRECT_PREFIX set, the body is left to the front-end
+    proxy (nginx ``X-Accel-Redirect``), which sends it with sendfile;
+    otherwise it is streamed in MEDIA_CHUNK_SIZE chunks.
+    """
+    path = served_media_path(filename)
+    try:
+        stat_result = await aiofiles.os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise HTTPException(status_code=404, detail="File not found")
+    if not stat.S_ISREG(stat_result.st_mode):
+        raise HTTPException(status_code=404, detail="File not found")
+
+    size = stat_result.st_size
+    etag = media_etag(filename, stat_result)
+    last_modified = format_datetime(
+        datetime.fromtimestamp(int(stat_result.st_mtime), timezone.utc), usegmt=True
+    )
+    headers = {
+        "ETag": etag,
+        "Last-Modified": last_modified,
+        "Cache-Control": settings.MEDIA_CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        client_tags = {
+            tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+        }
+        if "*" in client_tags or etag in client_tags:
+            return Response(status_code=304, headers=headers)
+
+    media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    if settings.MEDIA_ACCEL_REDIRECT_PREFIX:
+        redirect = settings.MEDIA_ACCEL_REDIRECT_PREFIX.rstrip("/")
+        headers["X-Accel-Redirect"] = f"{redirect}/{os.path.normpath(filename)}"
+        return Response(headers=headers, media_type=media_type)
+
+    start, end, status_code = 0, size - 1, 200
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    # If-Range: only send a part when the client's copy is still this file.
+    if range_header and if_range in (None, etag, last_modified):
+        byte_range = parse_range(range_header, size)
+        if byte_range is not None:
+            start, end = byte_range
+            status_code = 206
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+
+    if request.method == "HEAD":
+        return Response(status_code=status_code, headers=headers, media_type=media_type)
+    return StreamingResponse(
+        iter_file(path, start, end),
+        status_code=status_code,
+        headers=headers,
+        media_type=media_type,
+    )
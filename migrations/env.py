@@ -0,0 +1,77 @@
+from logging.config import fileConfig
+
+from sqlalchemy import engine_from_config, pool
+
+from alembic import context
+
+from config import settings
+from main import Base
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+# Callers such as init_db.py may pass an explicit URL; otherwise use the same
+# database as the API.
+if not config.get_main_option("sqlalchemy.url"):
+    config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
+
+target_metadata = Base.metadata
+
+
+def include_name(name, type_, parent_names) -> bool:
+    """Leave the dialect-specific full-text index of search_documents alone.
+
+    It is created by migration 0007 and is not part of the ORM metadata: the
+    FTS5 table (and its shadow tables) on SQLite, the tsvector column and its
+    GIN index on PostgreSQL.
+    """
+    if type_ == "table":
+        return not name.startswith("search_index")
+    if parent_names.get("table_name") == "search_documents":
+        return name not in ("document", "ix_search_documents_document")
+    return True
+
+
+def run_migrations_offline() -> None:
+    """Emit migration SQL to stdout without connecting to the database."""
+    url = config.get_main_option("sqlalchemy.url")
+    context.configure(
+        url=url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=url.startswith("sqlite"),
+        include_name=include_name,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run migrations against a live connection."""
+    connectable = engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            # SQLite cannot ALTER most constraints in place.
+            render_as_batch=connection.dialect.name == "sqlite",
+            include_name=include_name,
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
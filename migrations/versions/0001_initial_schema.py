@@ -0,0 +1,234 @@
+"""Initial schema
+
+Matches the tables that Base.metadata.create_all used to create at import
+time. Databases created that way can be adopted with ``alembic stamp 0001``
+(init_db.py does this automatically).
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 22:14:13.842383
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "clubs",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("location", sa.String(), nullable=True),
+        sa.Column("contact_email", sa.String(), nullable=True),
+        sa.Column("contact_phone", sa.String(), nullable=True),
+        sa.Column("website", sa.String(), nullable=True),
+        sa.Column("logo", sa.String(), nullable=True),
+        sa.Column("founded_date", sa.DateTime(), nullable=True),
+        sa.Column("coach_name", sa.String(), nullable=True),
+        sa.Column("coach_contact", sa.String(), nullable=True),
+        sa.Column("home_venue", sa.String(), nullable=True),
+        sa.Column("jersey_colors", sa.String(), nullable=True),
+        sa.Column("achievements", sa.Text(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "sponsors",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("logo", sa.String(), nullable=True),
+        sa.Column("website", sa.String(), nullable=True),
+        sa.Column("contact_person", sa.String(), nullable=True),
+        sa.Column("contact_email", sa.String(), nullable=True),
+        sa.Column("contact_phone", sa.String(), nullable=True),
+        sa.Column("sponsorship_type", sa.String(), nullable=True),
+        sa.Column("sponsorship_amount", sa.Float(), nullable=True),
+        sa.Column("start_date", sa.DateTime(), nullable=True),
+        sa.Column("end_date", sa.DateTime(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "system_settings",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("site_name", sa.String(), nullable=True),
+        sa.Column("maintenance_mode", sa.Boolean(), nullable=True),
+        sa.Column("registration_enabled", sa.Boolean(), nullable=True),
+        sa.Column("email_notifications", sa.Boolean(), nullable=True),
+        sa.Column("sms_notifications", sa.Boolean(), nullable=True),
+        sa.Column("auto_approval", sa.Boolean(), nullable=True),
+        sa.Column("membership_fee", sa.Float(), nullable=True),
+        sa.Column("session_timeout", sa.Integer(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "users",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("password_hash", sa.String(), nullable=False),
+        sa.Column("phone", sa.String(), nullable=True),
+        sa.Column("address", sa.String(), nullable=True),
+        sa.Column("role", sa.String(), nullable=True),
+        sa.Column("club_id", sa.String(), nullable=True),
+        sa.Column("position", sa.String(), nullable=True),
+        sa.Column("bio", sa.Text(), nullable=True),
+        sa.Column("membership_status", sa.String(), nullable=True),
+        sa.Column("membership_expiry", sa.DateTime(), nullable=True),
+        sa.Column("emergency_contact", sa.String(), nullable=True),
+        sa.Column("medical_info", sa.Text(), nullable=True),
+        sa.Column("profile_image", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("last_login", sa.DateTime(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["club_id"],
+            ["clubs.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("email"),
+    )
+    op.create_table(
+        "events",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("category", sa.String(), nullable=False),
+        sa.Column("date", sa.DateTime(), nullable=False),
+        sa.Column("time", sa.String(), nullable=True),
+        sa.Column("venue", sa.String(), nullable=True),
+        sa.Column("location", sa.String(), nullable=True),
+        sa.Column("age_group", sa.String(), nullable=True),
+        sa.Column("max_participants", sa.Integer(), nullable=True),
+        sa.Column("registration_fee", sa.Float(), nullable=True),
+        sa.Column("status", sa.String(), nullable=True),
+        sa.Column("image", sa.String(), nullable=True),
+        sa.Column("organizer", sa.String(), nullable=True),
+        sa.Column("organizing_club_id", sa.String(), nullable=True),
+        sa.Column("created_by", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["created_by"],
+            ["users.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["organizing_club_id"],
+            ["clubs.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "event_media",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("event_id", sa.String(), nullable=True),
+        sa.Column("filename", sa.String(), nullable=False),
+        sa.Column("media_type", sa.String(), nullable=True),
+        sa.Column("caption", sa.String(), nullable=True),
+        sa.Column("uploaded_by", sa.String(), nullable=True),
+        sa.Column("uploaded_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["event_id"],
+            ["events.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["uploaded_by"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "event_registrations",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("event_id", sa.String(), nullable=True),
+        sa.Column("user_id", sa.String(), nullable=True),
+        sa.Column("player_name", sa.String(), nullable=True),
+        sa.Column("player_position", sa.String(), nullable=True),
+        sa.Column("team_name", sa.String(), nullable=True),
+        sa.Column("emergency_contact", sa.String(), nullable=True),
+        sa.Column("medical_conditions", sa.Text(), nullable=True),
+        sa.Column("registration_date", sa.DateTime(), nullable=True),
+        sa.Column("payment_status", sa.String(), nullable=True),
+        sa.Column("payment_proof", sa.String(), nullable=True),
+        sa.Column("status", sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["event_id"],
+            ["events.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "gallery",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("title", sa.String(), nullable=True),
+        sa.Column("filename", sa.String(), nullable=False),
+        sa.Column("media_type", sa.String(), nullable=True),
+        sa.Column("caption", sa.String(), nullable=True),
+        sa.Column("event_id", sa.String(), nullable=True),
+        sa.Column("uploaded_by", sa.String(), nullable=True),
+        sa.Column("uploaded_at", sa.DateTime(), nullable=True),
+        sa.Column("is_featured", sa.Boolean(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["event_id"],
+            ["events.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["uploaded_by"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "payments",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=True),
+        sa.Column("event_id", sa.String(), nullable=True),
+        sa.Column("amount", sa.Float(), nullable=False),
+        sa.Column("payment_type", sa.String(), nullable=True),
+        sa.Column("payment_method", sa.String(), nullable=True),
+        sa.Column("status", sa.String(), nullable=True),
+        sa.Column("transaction_id", sa.String(), nullable=True),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("payment_date", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["event_id"],
+            ["events.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("payments")
+    op.drop_table("gallery")
+    op.drop_table("event_registrations")
+    op.drop_table("event_media")
+    op.drop_table("events")
+    op.drop_table("users")
+    op.drop_table("system_settings")
+    op.drop_table("sponsors")
+    op.drop_table("clubs")
@@ -0,0 +1,99 @@
+"""Add indexes for the hot filter columns
+
+Registrations get a unique (event_id, user_id) index, so duplicate rows left
+behind by the old check-then-insert race are removed first, keeping each
+user's earliest registration.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 22:14:33.326262
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        sa.text(
+            """
+            DELETE FROM event_registrations
+            WHERE EXISTS (
+                SELECT 1 FROM event_registrations AS older
+                WHERE older.event_id = event_registrations.event_id
+                  AND older.user_id = event_registrations.user_id
+                  AND (
+                    older.registration_date < event_registrations.registration_date
+                    OR (
+                      older.registration_date = event_registrations.registration_date
+                      AND older.id < event_registrations.id
+                    )
+                  )
+            )
+            """
+        )
+    )
+
+    op.create_index("ix_users_club_id", "users", ["club_id"])
+    op.create_index("ix_users_membership_status", "users", ["membership_status"])
+    op.create_index(
+        "ix_users_role_membership_status", "users", ["role", "membership_status"]
+    )
+
+    op.create_index("ix_events_category", "events", ["category"])
+    op.create_index("ix_events_date", "events", ["date"])
+    op.create_index("ix_events_status_date", "events", ["status", "date"])
+
+    op.create_index(
+        "ix_event_registrations_event_id_user_id",
+        "event_registrations",
+        ["event_id", "user_id"],
+        unique=True,
+    )
+    op.create_index(
+        "ix_event_registrations_user_id", "event_registrations", ["user_id"]
+    )
+
+    op.create_index("ix_payments_payment_type", "payments", ["payment_type"])
+    op.create_index(
+        "ix_payments_user_id_payment_date", "payments", ["user_id", "payment_date"]
+    )
+    op.create_index(
+        "ix_payments_status_payment_type", "payments", ["status", "payment_type"]
+    )
+
+    op.create_index("ix_event_media_event_id", "event_media", ["event_id"])
+    op.create_index("ix_gallery_event_id", "gallery", ["event_id"])
+    op.create_index("ix_gallery_media_type", "gallery", ["media_type"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_gallery_media_type", table_name="gallery")
+    op.drop_index("ix_gallery_event_id", table_name="gallery")
+    op.drop_index("ix_event_media_event_id", table_name="event_media")
+
+    op.drop_index("ix_payments_status_payment_type", table_name="payments")
+    op.drop_index("ix_payments_user_id_payment_date", table_name="payments")
+    op.drop_index("ix_payments_payment_type", table_name="payments")
+
+    op.drop_index("ix_event_registrations_user_id", table_name="event_registrations")
+    op.drop_index(
+        "ix_event_registrations_event_id_user_id", table_name="event_registrations"
+    )
+
+    op.drop_index("ix_events_status_date", table_name="events")
+    op.drop_index("ix_events_date", table_name="events")
+    op.drop_index("ix_events_category", table_name="events")
+
+    op.drop_index("ix_users_role_membership_status", table_name="users")
+    op.drop_index("ix_users_membership_status", table_name="users")
+    op.drop_index("ix_users_club_id", table_name="users")
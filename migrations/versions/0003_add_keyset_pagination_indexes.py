@@ -0,0 +1,37 @@
+"""Add (sort key, id) indexes backing keyset pagination
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 23:02:11.418506
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+KEYSET_INDEXES = [
+    ("ix_users_created_at_id", "users", ["created_at", "id"]),
+    ("ix_clubs_created_at_id", "clubs", ["created_at", "id"]),
+    ("ix_events_created_at_id", "events", ["created_at", "id"]),
+    ("ix_payments_payment_date_id", "payments", ["payment_date", "id"]),
+    ("ix_sponsors_created_at_id", "sponsors", ["created_at", "id"]),
+    ("ix_gallery_uploaded_at_id", "gallery", ["uploaded_at", "id"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in KEYSET_INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(KEYSET_INDEXES):
+        op.drop_index(name, table_name=table)
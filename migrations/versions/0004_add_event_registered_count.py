@@ -0,0 +1,53 @@
+"""Add a maintained registered_count to events
+
+Backfills the counter from existing registrations and marks events that are
+already at capacity as Full.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 23:40:52.074193
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "events",
+        sa.Column("registered_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.execute(
+        sa.text(
+            """
+            UPDATE events SET registered_count = (
+                SELECT COUNT(*) FROM event_registrations
+                WHERE event_registrations.event_id = events.id
+            )
+            """
+        )
+    )
+    op.execute(
+        sa.text(
+            """
+            UPDATE events SET status = 'Full'
+            WHERE status = 'Open'
+              AND max_participants IS NOT NULL
+              AND registered_count >= max_participants
+            """
+        )
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("events") as batch_op:
+        batch_op.drop_column("registered_count")
@@ -0,0 +1,64 @@
+"""Add payment_monthly_rollups and backfill it from payments
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:21:37.640915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "payment_monthly_rollups",
+        sa.Column("month", sa.String(), nullable=False),
+        sa.Column("payment_type", sa.String(), nullable=False),
+        sa.Column("completed_amount", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("completed_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("refunded_amount", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("refunded_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("month", "payment_type"),
+    )
+
+    if op.get_bind().dialect.name == "postgresql":
+        month = "to_char(payment_date, 'YYYY-MM')"
+    else:
+        month = "strftime('%Y-%m', payment_date)"
+
+    op.execute(
+        sa.text(
+            f"""
+            INSERT INTO payment_monthly_rollups (
+                month, payment_type, completed_amount, completed_count,
+                refunded_amount, refunded_count, updated_at
+            )
+            SELECT
+                {month},
+                COALESCE(payment_type, 'other'),
+                SUM(CASE WHEN status = 'Completed' THEN amount ELSE 0 END),
+                SUM(CASE WHEN status = 'Completed' THEN 1 ELSE 0 END),
+                SUM(CASE WHEN status = 'Refunded' THEN amount ELSE 0 END),
+                SUM(CASE WHEN status = 'Refunded' THEN 1 ELSE 0 END),
+                CURRENT_TIMESTAMP
+            FROM payments
+            WHERE payment_date IS NOT NULL
+              AND status IN ('Completed', 'Refunded')
+            GROUP BY {month}, COALESCE(payment_type, 'other')
+            """
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("payment_monthly_rollups")
@@ -0,0 +1,28 @@
+"""Add sponsors.updated_at for catalog ETags
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 01:05:44.210387
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("sponsors", sa.Column("updated_at", sa.DateTime(), nullable=True))
+    op.execute(sa.text("UPDATE sponsors SET updated_at = created_at"))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("sponsors") as batch_op:
+        batch_op.drop_column("updated_at")
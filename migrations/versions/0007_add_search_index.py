@@ -0,0 +1,129 @@
+"""Add search_documents and its full-text index
+
+search_documents holds one row per user, club and event. The full-text index
+over it is dialect specific and kept out of the ORM metadata: an external
+content FTS5 table maintained by triggers on SQLite, and a generated tsvector
+column with a GIN index on PostgreSQL. Existing rows are backfilled.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 02:12:08.517341
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SQLITE_FTS = [
+    """
+    CREATE VIRTUAL TABLE search_index USING fts5(
+        title,
+        body,
+        content='search_documents',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER search_documents_ai AFTER INSERT ON search_documents BEGIN
+        INSERT INTO search_index (rowid, title, body)
+        VALUES (new.id, new.title, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER search_documents_ad AFTER DELETE ON search_documents BEGIN
+        INSERT INTO search_index (search_index, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER search_documents_au AFTER UPDATE ON search_documents BEGIN
+        INSERT INTO search_index (search_index, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO search_index (rowid, title, body)
+        VALUES (new.id, new.title, new.body);
+    END
+    """,
+]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "search_documents",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("entity_type", sa.String(), nullable=False),
+        sa.Column("entity_id", sa.String(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("body", sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_search_documents_entity",
+        "search_documents",
+        ["entity_type", "entity_id"],
+        unique=True,
+    )
+
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            sa.text(
+                """
+                ALTER TABLE search_documents ADD COLUMN document tsvector
+                GENERATED ALWAYS AS (
+                    setweight(to_tsvector('simple', title), 'A')
+                    || setweight(to_tsvector('simple', body), 'B')
+                ) STORED
+                """
+            )
+        )
+        op.create_index(
+            "ix_search_documents_document",
+            "search_documents",
+            ["document"],
+            postgresql_using="gin",
+        )
+    else:
+        for statement in SQLITE_FTS:
+            op.execute(sa.text(statement))
+
+    op.execute(
+        sa.text(
+            """
+            INSERT INTO search_documents (entity_type, entity_id, title, body)
+            SELECT 'user', id, COALESCE(name, ''), COALESCE(email, '')
+            FROM users
+            UNION ALL
+            SELECT 'club', id, COALESCE(name, ''), COALESCE(location, '')
+            FROM clubs
+            UNION ALL
+            SELECT
+                'event',
+                id,
+                COALESCE(title, ''),
+                TRIM(COALESCE(description, '') || ' ' || COALESCE(venue, ''))
+            FROM events
+            """
+        )
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        for trigger in (
+            "search_documents_ai",
+            "search_documents_ad",
+            "search_documents_au",
+        ):
+            op.execute(sa.text(f"DROP TRIGGER IF EXISTS {trigger}"))
+        op.execute(sa.text("DROP TABLE IF EXISTS search_index"))
+    op.drop_table("search_documents")
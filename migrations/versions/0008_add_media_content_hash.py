@@ -0,0 +1,31 @@
+"""Add content_hash and file_size to gallery and event_media
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 03:02:41.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for table in ("gallery", "event_media"):
+        op.add_column(table, sa.Column("content_hash", sa.String(), nullable=True))
+        op.add_column(table, sa.Column("file_size", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    for table in ("gallery", "event_media"):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column("file_size")
+            batch_op.drop_column("content_hash")
@@ -0,0 +1,33 @@
+"""Add WebP rendition filenames to gallery and event_media
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 04:15:09.562871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for table in ("gallery", "event_media"):
+        op.add_column(
+            table, sa.Column("thumbnail_filename", sa.String(), nullable=True)
+        )
+        op.add_column(table, sa.Column("medium_filename", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    for table in ("gallery", "event_media"):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column("medium_filename")
+            batch_op.drop_column("thumbnail_filename")
@@ -0,0 +1,51 @@
+"""Add media_blobs for content-addressed, reference-counted media files
+
+Files uploaded before this revision keep their own names and are not
+reference counted; deleting their rows removes their files directly.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 05:02:27.318840
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0010"
+down_revision: Union[str, None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "media_blobs",
+        sa.Column("content_hash", sa.String(), nullable=False),
+        sa.Column("filename", sa.String(), nullable=False),
+        sa.Column("media_type", sa.String(), nullable=True),
+        sa.Column("file_size", sa.Integer(), nullable=True),
+        sa.Column("thumbnail_filename", sa.String(), nullable=True),
+        sa.Column("medium_filename", sa.String(), nullable=True),
+        sa.Column("ref_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("content_hash"),
+    )
+    op.create_index(
+        op.f("ix_gallery_content_hash"), "gallery", ["content_hash"], unique=False
+    )
+    op.create_index(
+        op.f("ix_event_media_content_hash"),
+        "event_media",
+        ["content_hash"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_event_media_content_hash"), table_name="event_media")
+    op.drop_index(op.f("ix_gallery_content_hash"), table_name="gallery")
+    op.drop_table("media_blobs")
@@ -0,0 +1,47 @@
+"""Shared fixtures: the application on a throwaway SQLite database."""
+
+import os
+import tempfile
+from contextlib import contextmanager
+
+# Settings are read at import time, so point them at scratch locations first.
+_data_directory = tempfile.mkdtemp(prefix="dsrfa-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_data_directory}/test.db"
+os.environ["UPLOAD_DIRECTORY"] = os.path.join(_data_directory, "uploads")
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import create_engine, event  # noqa: E402
+
+import main  # noqa: E402
+from init_db import run_migrations  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client():
+    engine = create_engine(os.environ["DATABASE_URL"])
+    run_migrations(engine)
+    engine.dispose()
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def count_queries(client):
+    """Context manager collecting the SQL statements run inside it."""
+
+    @contextmanager
+    def counter():
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = main.app.state.engine
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+    return counter
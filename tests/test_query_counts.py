@@ -0,0 +1,80 @@
+"""Regression guard for N+1 queries on the user endpoints.
+
+Counts are taken with the caller's principal already cached, as it is for
+every request after the first.
+"""
+
+import pytest
+
+PASSWORD = "secret-password"
+
+
+@pytest.fixture(scope="module")
+def admin_headers(client):
+    client.post(
+        "/auth/register",
+        json={
+            "name": "Admin",
+            "email": "admin@example.com",
+            "password": PASSWORD,
+            "role": "Admin",
+        },
+    )
+    response = client.post(
+        "/auth/login", json={"email": "admin@example.com", "password": PASSWORD}
+    )
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    client.get("/auth/me", headers=headers)
+    return headers
+
+
+@pytest.fixture(scope="module")
+def club_id(client, admin_headers):
+    response = client.post("/clubs", json={"name": "Query FC"}, headers=admin_headers)
+    club_id = response.json()["id"]
+    for number in range(5):
+        client.post(
+            "/auth/register",
+            json={
+                "name": f"Player {number}",
+                "email": f"player{number}@example.com",
+                "password": PASSWORD,
+                "club_id": club_id,
+            },
+        )
+    return club_id
+
+
+def test_list_users_is_one_query(client, admin_headers, club_id, count_queries):
+    with count_queries() as statements:
+        response = client.get("/users", headers=admin_headers)
+    assert response.status_code == 200
+    assert len(response.json()) >= 6
+    assert len(statements) == 1
+
+
+def test_me_is_one_query(client, admin_headers, count_queries):
+    with count_queries() as statements:
+        response = client.get("/auth/me", headers=admin_headers)
+    assert response.status_code == 200
+    assert len(statements) == 1
+
+
+def test_club_members_is_two_queries(client, admin_headers, club_id, count_queries):
+    with count_queries() as statements:
+        response = client.get(f"/clubs/{club_id}/members", headers=admin_headers)
+    assert response.status_code == 200
+    assert {member["club"] for member in response.json()} == {"Query FC"}
+    assert len(statements) == 2
+
+
+def test_login_is_two_queries(client, club_id, count_queries):
+    with count_queries() as statements:
+        response = client.post(
+            "/auth/login",
+            json={"email": "player0@example.com", "password": PASSWORD},
+        )
+    assert response.status_code == 200
+    assert response.json()["user"]["club"] == "Query FC"
+    # The user with their club, then the last_login update
+    assert len(statements) == 2